@@ -9,4 +9,16 @@ else
     echo "Config file already exists. Skipping copy operation."
 fi
 
-exec gunicorn -w 2 -b 0.0.0.0:5000 "rpidash:create_app()"
\ No newline at end of file
+# The collector holds the scheduler lock, the web workers stand by and take
+# over the scheduled tasks only if the collector exits
+python -m rpidash.collector &
+collector_pid=$!
+
+# Threaded workers, each open dashboard stream holds one worker thread
+gunicorn -w 2 -k gthread --threads 8 -b 0.0.0.0:5000 "rpidash:create_app()" &
+gunicorn_pid=$!
+
+trap 'kill -TERM "$collector_pid" "$gunicorn_pid" 2>/dev/null' TERM INT
+wait "$gunicorn_pid"
+kill -TERM "$collector_pid" 2>/dev/null
+wait
\ No newline at end of file
@@ -0,0 +1,125 @@
+# STDLIB
+import logging
+
+# THIRD PARTY
+from flask import Flask
+
+# FIRST PARTY
+from rpidash import database as db
+from rpidash.models.migrations import setup_db
+from rpidash.models.model_manager import MAX_POINTS
+from rpidash.services.broadcaster import Broadcaster
+from rpidash.services.cpu_sampler import cpu_sampler
+from rpidash.services.ring_buffer import RecentReadings
+from rpidash.services.task_scheduler import TaskScheduler
+from rpidash.services.utilization_snapshot import UtilizationSnapshot
+from rpidash.utils.utils import load_app_config
+from rpidash.views.api_views import (
+    CurrentUtilization,
+    MultiUtilizationHistory,
+    UtilizationExport,
+    UtilizationHistory,
+    UtilizationStream,
+)
+from rpidash.views.dashboard import Dashboard
+from rpidash.views.encoding import compress_response
+
+
+def create_app() -> Flask:
+    """Create and configure the app."""
+    app = Flask(__name__)
+
+    config = load_app_config()
+    app.config.update(config)
+    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = (
+        config.get("static", {}).get("max_age")
+    )
+
+    logging.basicConfig(
+        level=config["logging"]["level"],
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    # Template views
+    app.add_url_rule("/", view_func=Dashboard.as_view("dash"))
+
+    cpu_sampler.window = config.get("cpu_sampler", {}).get("window", 1)
+
+    # API views
+    snapshot = UtilizationSnapshot(
+        ttl=config.get("current_utilization", {}).get("cache_ttl", 0),
+    )
+    history_config = config.get("history", {})
+    recent = None
+    if history_config.get("recent_readings"):
+        deletion_config = config["scheduled_tasks"]["deletion"]
+        recent = RecentReadings(
+            history_config["recent_readings"],
+            retention=deletion_config["delete_older_than"]
+            if deletion_config["enabled"] else None,
+        )
+    app.add_url_rule(
+        "/services/current_utilization",
+        view_func=CurrentUtilization.as_view(
+            "current_utilization",
+            snapshot=snapshot,
+        ),
+    )
+    app.add_url_rule(
+        "/services/stream",
+        view_func=UtilizationStream.as_view(
+            "utilization_stream",
+            broadcaster=Broadcaster(
+                snapshot,
+                interval=config.get("stream", {}).get("interval", 10),
+                recent=recent,
+            ),
+        ),
+    )
+    app.add_url_rule(
+        "/services/history",
+        view_func=MultiUtilizationHistory.as_view(
+            "multi_utilization_history",
+            page_size=history_config.get("page_size", MAX_POINTS),
+            recent=recent,
+        ),
+    )
+    app.add_url_rule(
+        "/services/<table_name>/export",
+        view_func=UtilizationExport.as_view("utilization_export"),
+    )
+    app.add_url_rule(
+        "/services/<table_name>",
+        view_func=UtilizationHistory.as_view(
+            "utilization_history",
+            page_size=history_config.get("page_size", MAX_POINTS),
+            recent=recent,
+        ),
+    )
+
+    setup_db(config["database"])
+
+    if config["scheduled_tasks"]["enabled"]:  # pragma: no cover
+        scheduler = TaskScheduler()
+        scheduler.start()
+
+    compression = config.get("compression", {})
+
+    @app.after_request
+    def compress(response):
+        """Compress large API responses."""
+        return compress_response(
+            response,
+            min_size=compression.get("min_size", 1024),
+            level=compression.get("level", 6),
+        )
+
+    @app.teardown_appcontext
+    def shutdown_session(exception=None):  # pylint: disable=unused-argument
+        """
+        Remove database sessions at the end of the requests and
+        on the app shutdown.
+        """
+        db.db_session.remove()
+
+    return app
@@ -0,0 +1,45 @@
+# STDLIB
+import logging
+import signal
+import threading
+
+# FIRST PARTY
+from rpidash.models.migrations import setup_db
+from rpidash.services.cpu_sampler import cpu_sampler
+from rpidash.services.task_scheduler import TaskScheduler
+from rpidash.utils.utils import clear_cache, load_app_config
+
+
+def main() -> None:
+    """
+    Run the metric collection and deletion tasks in a standalone
+    process, without the web app.
+    """
+    config = load_app_config()
+
+    logging.basicConfig(
+        level=config["logging"]["level"],
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    if not config["scheduled_tasks"]["enabled"]:
+        logging.warning("Scheduled tasks are disabled, collector exiting")
+        return
+
+    setup_db(config["database"])
+    cpu_sampler.window = config.get("cpu_sampler", {}).get("window", 1)
+
+    stopped = threading.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *args: stopped.set())
+    # The configuration is read again on next use after SIGHUP
+    signal.signal(signal.SIGHUP, lambda *args: clear_cache())
+
+    scheduler = TaskScheduler()
+    scheduler.start()
+    stopped.wait()
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,5 +1,9 @@
+# STDLIB
+from typing import Optional
+
 # THIRD PARTY
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
 engine = None  # pylint: disable=invalid-name
@@ -14,13 +18,52 @@ Base = declarative_base()
 Base.query = db_session.query_property()
 
 
-def init_db(database_uri: str):
+def create_db_engine(
+    database_uri: str,
+    pragmas: Optional[dict] = None,
+    pool: Optional[dict] = None,
+) -> Engine:
+    """
+    Create a database engine with the given connection pool options,
+    setting the SQLite pragmas on every new connection.
+    """
+    db_engine = create_engine(database_uri, **(pool or {}))
+    if pragmas:
+        @event.listens_for(db_engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+            """Set the configured pragmas on a new connection."""
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+    return db_engine
+
+
+def init_db(
+    database_uri: str,
+    pragmas: Optional[dict] = None,
+    pool: Optional[dict] = None,
+):
     """
     Create the database engine.
     Bind the scoped session to the engine.
     Create all the tables defined by the models.
     """
     global engine  # pylint: disable=global-statement
-    engine = create_engine(database_uri)
+    engine = create_db_engine(database_uri, pragmas=pragmas, pool=pool)
     db_session.configure(bind=engine)
     Base.metadata.create_all(bind=engine)
+
+
+def incremental_vacuum(pages: int = 0) -> None:
+    """
+    Return up to the given number of free pages, or all of them when
+    zero, from the database file to the file system.
+    """
+    db_session.commit()
+    # Every step of the pragma frees one page and returns no rows, so it
+    # is run to completion as a script on the driver connection
+    db_session.connection().connection.driver_connection.executescript(
+        f"PRAGMA incremental_vacuum({int(pages)})",
+    )
+    db_session.commit()
@@ -0,0 +1,110 @@
+# STDLIB
+from typing import Callable, Dict, Optional
+
+# THIRD PARTY
+import psutil
+
+# FIRST PARTY
+from rpidash.models.models import (
+    CPUTemperature,
+    CPUUtilization,
+    MemoryUtilization,
+    create_reading_model,
+)
+from rpidash.services.system_utilization import SystemUtilization
+
+utilization = SystemUtilization()
+
+
+class Metric:  # pylint: disable=too-few-public-methods
+    """
+    Declaration of a recorded metric. Its name is the name of the table
+    storing the readings and of the history API routes, and value_key
+    the name of the reading column. The sample function returns the
+    current reading, or None when it isn't available. Metrics
+    without an interval are sampled in the shared collection pass. The
+    readings are stored by the given model, or by a model created from
+    the declaration.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        title: str,
+        unit: str,
+        value_key: str,
+        sample: Callable[[], Optional[float]],
+        *,
+        interval: Optional[int] = None,
+        model: Optional[type] = None,
+    ):
+        self.name = name
+        self.title = title
+        self.unit = unit
+        self.value_key = value_key
+        self.sample = sample
+        self.interval = interval
+        self.model = model or create_reading_model(name, value_key)
+
+    def to_dict(self) -> dict:
+        """Convert the declaration to a dictionary for the dashboard."""
+        return {"name": self.name, "title": self.title, "unit": self.unit}
+
+
+METRICS: Dict[str, Metric] = {}
+
+
+def register_metric(metric: Metric) -> Metric:
+    """Add the metric to the recorded metrics."""
+    if metric.name in METRICS:
+        raise ValueError(f"Metric '{metric.name}' is already registered.")
+    METRICS[metric.name] = metric
+    return metric
+
+
+def get_metrics() -> Dict[str, Metric]:
+    """Return a dictionary of names to the recorded metrics."""
+    return METRICS
+
+
+def sample_cpu_temperature() -> Optional[float]:
+    """Return the average temperature between CPU cores, if available."""
+    return utilization.read_cpu_temperature()
+
+
+def sample_load_average() -> float:
+    """Return the average system load over the last minute."""
+    return round(psutil.getloadavg()[0], 2)
+
+
+register_metric(Metric(
+    "cpu_temperature",
+    title="CPU Temperature",
+    unit="°C",
+    value_key="temperature",
+    sample=sample_cpu_temperature,
+    model=CPUTemperature,
+))
+register_metric(Metric(
+    "cpu_utilization",
+    title="CPU Utilization",
+    unit="%",
+    value_key="percentage",
+    sample=lambda: utilization.get_cpu_percentage().cpu_percentage,
+    model=CPUUtilization,
+))
+register_metric(Metric(
+    "memory_utilization",
+    title="Memory Utilization",
+    unit="%",
+    value_key="percentage",
+    sample=lambda: utilization.get_memory_utilization().memory_percentage,
+    model=MemoryUtilization,
+))
+register_metric(Metric(
+    "load_average",
+    title="Load Average (1 min)",
+    unit="",
+    value_key="load",
+    sample=sample_load_average,
+))
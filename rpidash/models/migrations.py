@@ -0,0 +1,109 @@
+# STDLIB
+import logging
+
+# THIRD PARTY
+from sqlalchemy import Float, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+# FIRST PARTY
+from rpidash import database as db
+from rpidash.models import partitions
+from rpidash.models.model_manager import ModelManager
+
+
+def migrate_value_columns(engine: Engine) -> None:
+    """
+    Convert tables created when readings were stored as strings to
+    numeric reading columns, keeping the recorded history.
+    """
+    inspector = inspect(engine)
+    for table_name, model in ModelManager.get_models().items():
+        if not inspector.has_table(table_name):
+            continue
+        value_key = model.get_value_key()
+        columns = {
+            column["name"]: column["type"]
+            for column in inspector.get_columns(table_name)
+        }
+        if isinstance(columns[value_key], Float):
+            continue
+        logging.info("Migrating %s table to numeric readings", table_name)
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE {table_name} RENAME TO {table_name}_old"
+            ))
+            model.__table__.create(connection)
+            connection.execute(text(
+                f"INSERT INTO {table_name} (id, {value_key}, date) "
+                f"SELECT id, CAST({value_key} AS REAL), date "
+                f"FROM {table_name}_old"
+            ))
+            connection.execute(text(f"DROP TABLE {table_name}_old"))
+
+
+def migrate_rollup_durations(engine: Engine) -> None:
+    """
+    Add the duration column to rollup tables created before the rollup
+    averages were weighted by time. The existing rows are counted as
+    covering their whole bucket.
+    """
+    inspector = inspect(engine)
+    for rollup_model in ModelManager.get_rollup_models().values():
+        table_name = rollup_model.__tablename__
+        if not inspector.has_table(table_name) or "duration" in {
+            column["name"] for column in inspector.get_columns(table_name)
+        }:
+            continue
+        logging.info("Adding durations to %s table", table_name)
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE {table_name} ADD COLUMN duration FLOAT"
+            ))
+            connection.execute(text(
+                f"UPDATE {table_name} SET duration = {rollup_model.resolution}"
+            ))
+
+
+def migrate_auto_vacuum(engine: Engine) -> None:
+    """
+    Switch SQLite databases to incremental auto-vacuum, so the space of
+    deleted records can be returned to the file system in small steps.
+    Existing databases are rebuilt once with a full vacuum, which is
+    retried on the next start when another process holds the database.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        connection = connection.execution_options(
+            isolation_level="AUTOCOMMIT",
+        )
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            return
+        logging.info("Migrating database to incremental auto-vacuum")
+        try:
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+        except OperationalError as exc:
+            logging.warning("Couldn't vacuum the database: %s", exc)
+
+
+def migrate_db(engine: Engine) -> None:
+    """Bring a database created by an older version up to date."""
+    migrate_value_columns(engine)
+    migrate_rollup_durations(engine)
+    migrate_auto_vacuum(engine)
+    ModelManager().backfill_rollups()
+
+
+def setup_db(config: dict) -> None:
+    """
+    Set up the database of the given database configuration. It is
+    brought up to date by the process running the scheduled tasks.
+    """
+    partitions.set_period(config.get("partition_period"))
+    db.init_db(
+        database_uri=config["uri"],
+        pragmas=config.get("pragmas"),
+        pool=config.get("pool"),
+    )
@@ -1,18 +1,67 @@
 # STDLIB
+import base64
+import binascii
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Type, Union
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
+
+# THIRD PARTY
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import Select
 
 # FIRST PARTY
 from rpidash.database import db_session
-from rpidash.models.models import (
-    CPUTemperature,
-    CPUUtilization,
-    MemoryUtilization,
-)
+from rpidash.metrics import get_metrics
+from rpidash.models import partitions
+from rpidash.models.models import RollupHour, RollupMinute, RollupQuarterHour
+from rpidash.models.time_weighted import MAX_HOLD, TimeWeightedBuckets
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+BUCKETS = {"1m": 60, "5m": 300, "1h": 3600}
+MAX_POINTS = 10000
+EXPORT_CHUNK_SIZE = 1000
+DELETE_BATCH_SIZE = 1000
+# Default retention (in seconds) of the rollup rows per resolution
+ROLLUP_RETENTION = {"1m": 604800, "15m": 7776000, "1h": 31536000}
+
+
+def to_timestamp(date: datetime) -> float:
+    """Return the seconds since the epoch of the stored local date."""
+    return (date - EPOCH).total_seconds()
 
 
-class ModelManager:
+def encode_cursor(date: datetime, row_id: int) -> str:
+    """Encode the date and the id of the last returned row as a token."""
+    token = f"{date.isoformat()}/{row_id}".encode()
+    return base64.urlsafe_b64encode(token).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode the date and the row id of a cursor token."""
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, row_id = token.decode().split("/")
+        return datetime.fromisoformat(date), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("The 'cursor' parameter is invalid") from exc
+
+
+class ModelManager:  # pylint: disable=too-many-public-methods
     """Model manager for handling database operations."""
 
     def __init__(self, table_name: Optional[str] = None):
@@ -21,23 +70,29 @@ class ModelManager:
             self.value_key = self.model.get_value_key()
 
     @staticmethod
-    def get_models() -> Dict[str, Type[Union[
-        CPUTemperature,
-        CPUUtilization,
-        MemoryUtilization,
+    def get_models() -> Dict[str, type]:
+        """
+        Return a dictionary of table names to the model classes of the
+        recorded metrics.
+        """
+        return {
+            name: metric.model for name, metric in get_metrics().items()
+        }
+
+    @staticmethod
+    def get_rollup_models() -> Dict[str, Type[Union[
+        RollupMinute,
+        RollupQuarterHour,
+        RollupHour,
     ]]]:
-        """Return a dictionary of table names to model classes."""
+        """Return a dictionary of resolution names to rollup model classes."""
         return {
-            CPUTemperature.__tablename__: CPUTemperature,
-            CPUUtilization.__tablename__: CPUUtilization,
-            MemoryUtilization.__tablename__: MemoryUtilization,
+            "1m": RollupMinute,
+            "15m": RollupQuarterHour,
+            "1h": RollupHour,
         }
 
-    def get_model(self, table_name: str) -> Type[Union[
-        CPUTemperature,
-        CPUUtilization,
-        MemoryUtilization,
-    ]]:
+    def get_model(self, table_name: str) -> type:
         """Return the model class for the given table name."""
         try:
             return self.get_models()[table_name]
@@ -46,54 +101,789 @@ class ModelManager:
                 f"Model for table '{table_name}' not found."
             ) from exc
 
-    def retrieve_data(
+    def get_rollup_model(self, bucket_seconds: int) -> Optional[Type[Union[
+        RollupMinute,
+        RollupQuarterHour,
+        RollupHour,
+    ]]]:
+        """Return the coarsest rollup model that fits into the bucket."""
+        rollup_models = [
+            model for model in self.get_rollup_models().values()
+            if model.resolution <= bucket_seconds
+        ]
+        return max(
+            rollup_models,
+            key=lambda model: model.resolution,
+            default=None,
+        )
+
+    @staticmethod
+    def parse_date(value: Optional[str], name: str) -> Optional[datetime]:
+        """Parse a date query parameter."""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, DATE_FORMAT)
+        except ValueError as exc:
+            raise ValueError(
+                f"The '{name}' parameter must be in the format"
+                " 'YYYY-MM-DDTHH:MM:SS'"
+            ) from exc
+
+    @staticmethod
+    def parse_count(value: Optional[str], name: str) -> Optional[int]:
+        """Parse a positive count query parameter, up to MAX_POINTS."""
+        if not value:
+            return None
+        try:
+            count = int(value)
+        except ValueError as exc:
+            raise ValueError(
+                f"The '{name}' parameter must be an integer"
+            ) from exc
+        if count < 1:
+            raise ValueError(f"The '{name}' parameter must be positive")
+        return min(count, MAX_POINTS)
+
+    def parse_max_points(self, max_points: Optional[str]) -> Optional[int]:
+        """Parse the max_points query parameter."""
+        return self.parse_count(max_points, "max_points")
+
+    def parse_date_range(
         self,
         recorded_after: Optional[str] = None,
-    ) -> Dict[str, List[str]]:
-        """Retrieve data from the database, optionally filtered by date."""
-        query = self.model.query
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]:
+        """
+        Parse the recorded_after, start and end query parameters. The
+        recorded_after date is moved one second forward, so that the
+        reading recorded at that second is excluded.
+        """
+        recorded_after_dt = self.parse_date(recorded_after, "recorded_after")
+        if recorded_after_dt:
+            recorded_after_dt += timedelta(seconds=1)
+        return (
+            recorded_after_dt,
+            self.parse_date(start, "start"),
+            self.parse_date(end, "end"),
+        )
+
+    @staticmethod
+    def date_filters(
+        column,
+        recorded_after: Optional[datetime] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list:
+        """Return the date filters for the given column."""
+        filters = []
         if recorded_after:
+            filters.append(column > recorded_after)
+        if start:
+            filters.append(column >= start)
+        if end:
+            filters.append(column <= end)
+        return filters
+
+    def get_date_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Return the dates of the oldest and the newest stored reading,
+        including readings only kept in the rollups.
+        """
+        bounds = self.get_table_bounds(partitions.get_tables(self.model))
+        first = min(filter(None, (row[2] for row in bounds)), default=None)
+        last = max(filter(None, (row[3] for row in bounds)), default=None)
+        rollup_first = db_session.query(
+            func.min(RollupHour.date),
+        ).filter(RollupHour.metric == self.model.__tablename__).scalar()
+        if rollup_first and (not first or rollup_first < first):
+            first = rollup_first
+        return first, last
+
+    @staticmethod
+    def get_table_bounds(tables: list) -> List[tuple]:
+        """
+        Return the minimum and maximum id and date of every table. Only
+        the bounds of the primary key and of the indexed dates are read,
+        in a single statement, so they are cheap to compute.
+        """
+        row = db_session.execute(select(*(
+            select(aggregate(column)).scalar_subquery()
+            for table in tables
+            for column in (table.c.id, table.c.date)
+            for aggregate in (func.min, func.max)
+        ))).one()
+        return [tuple(row[index:index + 4]) for index in range(0, len(row), 4)]
+
+    def get_cache_validators(self) -> Tuple[tuple, Optional[datetime]]:
+        """
+        Return a tuple of values that changes whenever readings or
+        rollups of the model are stored or deleted, and the date of the
+        newest reading.
+        """
+        tables = partitions.get_tables(self.model)
+        bounds = self.get_table_bounds(tables)
+        rollup_dates = db_session.execute(select(*(
+            select(func.min(model.date)).where(
+                model.metric == self.model.__tablename__,
+            ).scalar_subquery()
+            for model in self.get_rollup_models().values()
+        ))).one()
+        validators = (
+            tuple(table.name for table in tables),
+            tuple(bounds),
+            tuple(rollup_dates),
+        )
+        return validators, max(
+            filter(None, (row[3] for row in bounds)),
+            default=None,
+        )
+
+    def get_bucket_seconds(
+        self,
+        bucket: Optional[str] = None,
+        max_points: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[Optional[int], Optional[datetime]]:
+        """
+        Return the aggregation bucket size in seconds, either from the
+        requested bucket or derived from the maximum number of points,
+        and the date the buckets are aligned to. Requested buckets are
+        aligned to the epoch, derived ones to the start of the range, so
+        that max_points of them cover it.
+        """
+        if bucket:
             try:
-                recorded_after_dt = datetime.strptime(
-                    recorded_after,
-                    "%Y-%m-%dT%H:%M:%S",
-                )
-                recorded_after_dt += timedelta(seconds=1)
-                query = query.filter(self.model.date > recorded_after_dt)
-            except ValueError as exc:
+                return BUCKETS[bucket], None
+            except KeyError as exc:
                 raise ValueError(
-                    "The 'recorded_after' parameter must be in the format"
-                    " 'YYYY-MM-DDTHH:MM:SS'"
+                    "The 'bucket' parameter must be one of: "
+                    f"{', '.join(BUCKETS)}"
                 ) from exc
-        data = query.limit(10000).all()
-
-        values = []
-        dates = []
-        for item in data:
-            values.append(getattr(item, self.value_key))
-            dates.append(item.date.strftime("%Y-%m-%dT%H:%M:%S"))
-
-        return {"values": values, "dates": dates}
-
-    def store_record(self, reading: int) -> None:
-        """Store a new record in the database."""
-        instance = self.model()
-        setattr(instance, self.value_key, reading)
-        db_session.add(instance)
-        logging.info("Storing %s: %s%%", self.model.__tablename__, reading)
+        max_points = self.parse_max_points(max_points)
+        if not max_points:
+            return None, None
+        if not start or not end:
+            first, last = self.get_date_range()
+            start = start or first
+            end = end or last
+        if not start or not end:
+            return None, None
+        span = (end - start).total_seconds()
+        return max(1, -int(-span // max_points)), start
+
+    def retrieve_data(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        *,
+        recorded_after: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        max_points: Optional[str] = None,
+        bucket: Optional[str] = None,
+        epoch_dates: bool = False,
+        cursor: Optional[str] = None,
+        page_size: Optional[str] = None,
+    ) -> Dict[str, List]:
+        """
+        Retrieve data from the database, optionally filtered by date.
+        When a bucket or a maximum number of points is requested, the
+        readings are aggregated into time buckets in the database.
+        Otherwise the raw readings are returned in pages of page_size
+        readings, continued from the next_cursor of the previous page.
+        Dates are formatted as ISO strings, or as integer seconds since
+        the epoch of the stored local dates when epoch_dates is set.
+        Only the partitions overlapping the requested range are read.
+        """
+        recorded_after_dt, start_dt, end_dt = self.parse_date_range(
+            recorded_after,
+            start,
+            end,
+        )
+        range_start = max(
+            filter(None, (start_dt, recorded_after_dt)),
+            default=None,
+        )
+        filters_for = partial(
+            self.date_filters,
+            recorded_after=recorded_after_dt,
+            start=start_dt,
+            end=end_dt,
+        )
+
+        bucket_seconds, origin = self.get_bucket_seconds(
+            bucket=bucket,
+            max_points=max_points,
+            start=range_start,
+            end=end_dt,
+        )
+        # The bucket starting at the end of the range, if any, only holds
+        # the readings at the end date
+        limit = self.parse_max_points(max_points) if origin else MAX_POINTS
+        if not bucket_seconds:
+            if not cursor:
+                source = partitions.get_source(self.model, range_start, end_dt)
+                filters = filters_for(source.c.date)
+            else:
+                cursor_date, cursor_id = decode_cursor(cursor)
+                source = partitions.get_source(
+                    self.model,
+                    max(filter(None, (range_start, cursor_date))),
+                    end_dt,
+                )
+                filters = filters_for(source.c.date)
+                filters.append(
+                    tuple_(source.c.date, source.c.id)
+                    > tuple_(cursor_date, cursor_id),
+                )
+            return self.retrieve_raw_data(
+                source,
+                filters,
+                epoch_dates,
+                self.parse_count(page_size, "page_size") or MAX_POINTS,
+            )
+        if cursor:
+            raise ValueError(
+                "The 'cursor' parameter is only supported for raw readings"
+            )
+        rollup_model = self.get_rollup_model(bucket_seconds)
+        if rollup_model:
+            return self.retrieve_rollup_data(
+                rollup_model,
+                filters_for(rollup_model.date),
+                bucket_seconds,
+                epoch_dates,
+                origin=origin,
+                limit=limit,
+            )
+        return self.retrieve_aggregated_data(
+            range_start,
+            end_dt,
+            bucket_seconds,
+            epoch_dates,
+            origin=origin,
+            limit=limit,
+        )
+
+    def retrieve_raw_data(
+        self,
+        source,
+        filters: list,
+        epoch_dates: bool = False,
+        page_size: int = MAX_POINTS,
+    ) -> Dict[str, List]:
+        """
+        Retrieve a page of the raw readings ordered by date and id, with
+        the cursor of the next page, if there is one. Only the date, value
+        and id columns are selected and the dates are formatted by the
+        database, so no model instances are built for the rows.
+        """
+        rows = db_session.execute(
+            self.raw_data_statement(source, filters, epoch_dates)
+            .add_columns(type_coerce(source.c.date, String), source.c.id)
+            .limit(page_size + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(
+                datetime.fromisoformat(rows[-1][2]),
+                rows[-1][3],
+            )
+        dates, values, _, _ = self.transpose(rows, 4)
+        return {"values": values, "dates": dates, "next_cursor": next_cursor}
+
+    def retrieve_latest_rows(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> List[tuple]:
+        """
+        Retrieve up to limit of the newest (date, reading) rows, newest
+        first, with the dates as stored. When a stored date is given, only
+        the rows stored after it are retrieved.
+        """
+        source = partitions.get_source(
+            self.model,
+            datetime.fromisoformat(after) if after else None,
+        )
+        date_column = type_coerce(source.c.date, String)
+        statement = select(date_column, source.c[self.value_key]).order_by(
+            source.c.date.desc(),
+            source.c.id.desc(),
+        ).limit(limit)
+        if after:
+            statement = statement.where(date_column > after)
+        return db_session.execute(statement).all()
+
+    def raw_data_statement(
+        self,
+        source,
+        filters: list,
+        epoch_dates: bool = False,
+    ) -> Select:
+        """Return the statement selecting the (date, reading) rows."""
+        return select(
+            self.format_date(source.c.date, epoch_dates),
+            source.c[self.value_key],
+        ).where(*filters).order_by(source.c.date, source.c.id)
+
+    def export_statement(
+        self,
+        recorded_after: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        epoch_dates: bool = False,
+    ) -> Select:
+        """
+        Return the statement selecting all the raw (date, reading) rows
+        matching the date filters, without limiting the number of rows.
+        Readings stored after the call are excluded, so that every
+        execution of the statement returns the same rows.
+        """
+        recorded_after_dt, start_dt, end_dt = self.parse_date_range(
+            recorded_after,
+            start,
+            end,
+        )
+        tables = partitions.get_tables(
+            self.model,
+            max(filter(None, (start_dt, recorded_after_dt)), default=None),
+            end_dt,
+        )
+        last_date = max(
+            filter(None, (row[3] for row in self.get_table_bounds(tables))),
+            default=datetime.min,
+        )
+        source = partitions.combine_tables(self.model, tables)
+        filters = self.date_filters(
+            source.c.date,
+            recorded_after_dt,
+            start_dt,
+            end_dt,
+        )
+        filters.append(source.c.date <= last_date)
+        return self.raw_data_statement(source, filters, epoch_dates)
+
+    @staticmethod
+    def iterate_chunks(
+        statement: Select,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> Iterator[list]:
+        """
+        Execute the statement and yield its rows in chunks of the given
+        size. The rows are fetched from the cursor one chunk at a time,
+        so the memory use does not depend on the number of rows.
+        """
+        result = db_session.execute(
+            statement.execution_options(yield_per=chunk_size),
+        )
+        yield from result.partitions()
+
+    def retrieve_aggregated_data(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        bucket_seconds: int,
+        epoch_dates: bool = False,
+        *,
+        origin: Optional[datetime] = None,
+        limit: int = MAX_POINTS,
+    ) -> Dict[str, List]:
+        """
+        Retrieve the minimum, time-weighted average and maximum reading
+        of up to limit time buckets of the given size between the dates,
+        aligned to the origin date or to the epoch. The readings around
+        the range are read as well, as they hold their values into it.
+        """
+        hold = timedelta(seconds=MAX_HOLD)
+        source = partitions.get_source(
+            self.model,
+            start - hold if start else None,
+            end + hold if end else None,
+        )
+        buckets = TimeWeightedBuckets(
+            bucket_seconds,
+            origin=int(to_timestamp(origin)) if origin else 0,
+        )
+        for chunk in self.iterate_chunks(
+            select(
+                type_coerce(source.c.date, String),
+                source.c[self.value_key],
+            ).where(*self.date_filters(
+                source.c.date,
+                start=start - hold if start else None,
+                end=end + hold if end else None,
+            )).order_by(source.c.date, source.c.id),
+        ):
+            for date, reading in chunk:
+                buckets.add(
+                    to_timestamp(datetime.fromisoformat(date)),
+                    reading,
+                )
+        first = to_timestamp(start) if start else float("-inf")
+        last = to_timestamp(end) if end else float("inf")
+        rows = [
+            (
+                bucket if epoch_dates else time.strftime(
+                    DATE_FORMAT,
+                    time.gmtime(bucket),
+                ),
+                round(average, 2),
+                minimum,
+                maximum,
+            )
+            for bucket, minimum, average, maximum, _, _ in buckets.rows()
+            if first <= bucket <= last
+        ]
+        return self.format_aggregated_data(rows[:limit])
+
+    def retrieve_rollup_data(  # pylint: disable=too-many-arguments
+        self,
+        rollup_model: Type[Union[
+            RollupMinute,
+            RollupQuarterHour,
+            RollupHour,
+        ]],
+        filters: list,
+        bucket_seconds: int,
+        epoch_dates: bool = False,
+        *,
+        origin: Optional[datetime] = None,
+        limit: int = MAX_POINTS,
+    ) -> Dict[str, List]:
+        """
+        Retrieve the minimum, time-weighted average and maximum reading
+        of up to limit time buckets by merging the rows of the given
+        rollup model. The buckets are aligned to the first rollup row
+        not before the origin date, or to the epoch.
+        """
+        resolution = rollup_model.resolution
+        bucket_seconds = -(-bucket_seconds // resolution) * resolution
+        offset = 0
+        if origin:
+            offset = -(-int(to_timestamp(origin)) // resolution) * resolution
+        epoch = cast(func.strftime("%s", rollup_model.date), Integer)
+        bucket_start = (
+            (epoch - offset) // bucket_seconds * bucket_seconds + offset
+        )
+        query = db_session.query(
+            self.bucket_date(bucket_start, epoch_dates),
+            func.round(
+                func.coalesce(
+                    func.sum(rollup_model.average * rollup_model.duration)
+                    / func.nullif(func.sum(rollup_model.duration), 0),
+                    func.sum(rollup_model.average * rollup_model.count)
+                    / func.sum(rollup_model.count),
+                ),
+                2,
+            ),
+            func.min(rollup_model.minimum),
+            func.max(rollup_model.maximum),
+        ).filter(
+            rollup_model.metric == self.model.__tablename__,
+            *filters,
+        ).group_by(bucket_start).order_by(bucket_start)
+        return self.format_aggregated_data(query.limit(limit).all())
+
+    @staticmethod
+    def bucket_date(bucket_start, epoch_dates: bool = False):
+        """Return the SQL expression formatting the bucket start date."""
+        if epoch_dates:
+            return bucket_start
+        return func.strftime(DATE_FORMAT, bucket_start, "unixepoch")
+
+    @staticmethod
+    def format_date(column, epoch_dates: bool = False):
+        """Return the SQL expression formatting a date column."""
+        if epoch_dates:
+            return cast(func.strftime("%s", column), Integer)
+        return func.strftime(DATE_FORMAT, column)
+
+    @staticmethod
+    def transpose(rows: list, width: int) -> List[list]:
+        """Split rows of the given width into one list per column."""
+        return [list(column) for column in zip(*rows)] or [
+            [] for _ in range(width)
+        ]
+
+    def format_aggregated_data(self, data: list) -> Dict[str, List]:
+        """Split aggregated rows into lists of dates and values."""
+        dates, values, minimums, maximums = self.transpose(data, 4)
+        return {
+            "values": values,
+            "min": minimums,
+            "max": maximums,
+            "dates": dates,
+        }
+
+    def store_record(self, reading: float) -> None:
+        """Store a new record in the database and update its rollups."""
+        logging.info("Storing %s: %s", self.model.__tablename__, reading)
+        self.store_records(
+            [(self.model.__tablename__, datetime.now(), reading)],
+        )
+
+    def store_records(
+        self,
+        records: List[Tuple[str, datetime, float]],
+    ) -> None:
+        """
+        Store (table name, date, reading) records of any metrics into
+        the tables or partitions of their dates and update their rollups
+        in a single transaction.
+        """
+        tables = {}
+        rows = {}
+        for table_name, date, reading in records:
+            model = self.get_model(table_name)
+            key = (model, partitions.get_partition_start(date))
+            if key not in tables:
+                tables[key] = partitions.get_write_table(model, date)
+            rows.setdefault(tables[key], []).append(
+                {model.get_value_key(): reading, "date": date},
+            )
+        for table, table_rows in rows.items():
+            db_session.execute(insert(table), table_rows)
+        self.update_rollups(records)
+        logging.info("Storing %s records", len(records))
         db_session.commit()
 
-    def delete_records(self, older_than: int) -> None:
-        """Delete records older than the specified number of seconds."""
+    def get_previous_reading(
+        self,
+        table_name: str,
+        date: datetime,
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Return the (timestamp, reading) of the newest reading of the
+        metric stored before the date, if it still holds its value then.
+        """
+        model = self.get_model(table_name)
+        source = partitions.get_source(
+            model,
+            date - timedelta(seconds=MAX_HOLD),
+            date,
+        )
+        row = db_session.execute(
+            select(
+                type_coerce(source.c.date, String),
+                source.c[model.get_value_key()],
+            ).where(
+                source.c.date >= date - timedelta(seconds=MAX_HOLD),
+                source.c.date < date,
+            ).order_by(source.c.date.desc(), source.c.id.desc()).limit(1)
+        ).first()
+        if not row:
+            return None
+        return to_timestamp(datetime.fromisoformat(row[0])), row[1]
+
+    @staticmethod
+    def get_rollup_rows(
+        table_name: str,
+        buckets: TimeWeightedBuckets,
+    ) -> List[dict]:
+        """Return the rollup rows of the metric's aggregated buckets."""
+        return [
+            {
+                "metric": table_name,
+                "date": EPOCH + timedelta(seconds=start),
+                "minimum": minimum,
+                "average": average,
+                "maximum": maximum,
+                "count": count,
+                "duration": duration,
+            }
+            for start, minimum, average, maximum, count, duration
+            in buckets.rows()
+        ]
+
+    def update_rollups(
+        self,
+        records: List[Tuple[str, datetime, float]],
+    ) -> None:
+        """
+        Merge (table name, date, reading) records into their rollups.
+        The stored reading preceding the records of a metric holds its
+        value until the first of them.
+        """
+        readings = {}
+        for table_name, date, reading in sorted(
+            records,
+            key=lambda record: record[1],
+        ):
+            readings.setdefault(table_name, []).append((date, reading))
+        previous = {
+            table_name: self.get_previous_reading(
+                table_name,
+                metric_readings[0][0],
+            )
+            for table_name, metric_readings in readings.items()
+        }
+        for rollup_model in self.get_rollup_models().values():
+            rows = []
+            for table_name, metric_readings in readings.items():
+                buckets = TimeWeightedBuckets(
+                    rollup_model.resolution,
+                    previous[table_name],
+                )
+                for date, reading in metric_readings:
+                    buckets.add(to_timestamp(date), reading)
+                rows.extend(self.get_rollup_rows(table_name, buckets))
+            if not rows:
+                continue
+            statement = sqlite_insert(rollup_model)
+            excluded = statement.excluded
+            duration = rollup_model.duration + excluded.duration
+            db_session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["metric", "date"],
+                    set_={
+                        "minimum": func.min(
+                            rollup_model.minimum,
+                            excluded.minimum,
+                        ),
+                        "maximum": func.max(
+                            rollup_model.maximum,
+                            excluded.maximum,
+                        ),
+                        "average": case(
+                            (
+                                duration > 0,
+                                (
+                                    rollup_model.average
+                                    * rollup_model.duration
+                                    + excluded.average * excluded.duration
+                                ) / duration,
+                            ),
+                            else_=(
+                                rollup_model.average * rollup_model.count
+                                + excluded.average * excluded.count
+                            ) / (rollup_model.count + excluded.count),
+                        ),
+                        "count": rollup_model.count + excluded.count,
+                        "duration": duration,
+                    },
+                ),
+                rows,
+            )
+
+    def backfill_rollups(self) -> None:
+        """
+        Build the rollups of every metric that has no rollup rows yet
+        from the raw readings already stored in the database.
+        """
+        for table_name, model in self.get_models().items():
+            rollup_models = [
+                rollup_model
+                for rollup_model in self.get_rollup_models().values()
+                if not rollup_model.query.filter(
+                    rollup_model.metric == table_name,
+                ).first()
+            ]
+            if not rollup_models:
+                continue
+            buckets = [
+                TimeWeightedBuckets(rollup_model.resolution)
+                for rollup_model in rollup_models
+            ]
+            source = partitions.get_source(model)
+            for chunk in self.iterate_chunks(
+                select(
+                    type_coerce(source.c.date, String),
+                    source.c[model.get_value_key()],
+                ).order_by(source.c.date, source.c.id),
+            ):
+                for date, reading in chunk:
+                    timestamp = to_timestamp(datetime.fromisoformat(date))
+                    for model_buckets in buckets:
+                        model_buckets.add(timestamp, reading)
+            for rollup_model, model_buckets in zip(rollup_models, buckets):
+                rows = self.get_rollup_rows(table_name, model_buckets)
+                if rows:
+                    logging.info(
+                        "Backfilling %s %s rollup rows for %s",
+                        len(rows),
+                        rollup_model.__tablename__,
+                        table_name,
+                    )
+                    db_session.execute(insert(rollup_model), rows)
+        db_session.commit()
+
+    def delete_records(
+        self,
+        older_than: int,
+        rollup_retention: Optional[Dict[str, int]] = None,
+        batch_size: int = DELETE_BATCH_SIZE,
+        pause: float = 0,
+    ) -> None:
+        """
+        Delete records older than the specified number of seconds and
+        rollup rows older than the retention of their resolution, which
+        defaults to ROLLUP_RETENTION.
+        Partitions holding only older records are dropped as a whole,
+        the records of the remaining ones are kept until they expire.
+        """
         cutoff_date = datetime.now() - timedelta(seconds=older_than)
+        models = []
         for model in self.get_models().values():
-            records_to_delete = model.query.filter(
-                model.date < cutoff_date
-            ).delete()
+            for name in partitions.drop_expired_partitions(model, cutoff_date):
+                logging.info("Dropped %s partition", name)
+            models.append((model, cutoff_date))
+        rollup_models = self.get_rollup_models()
+        for resolution, retention in {
+            **ROLLUP_RETENTION,
+            **(rollup_retention or {}),
+        }.items():
+            models.append((
+                rollup_models[resolution],
+                datetime.now() - timedelta(seconds=retention),
+            ))
+        for model, model_cutoff_date in models:
+            records_deleted = self.delete_older_than(
+                model,
+                model_cutoff_date,
+                batch_size=batch_size,
+                pause=pause,
+            )
             logging.info(
-                "Deleting %s records from %s table older than %s",
-                records_to_delete,
+                "Deleted %s records from %s table older than %s",
+                records_deleted,
                 model.__tablename__,
-                cutoff_date,
+                model_cutoff_date,
+            )
+
+    @staticmethod
+    def delete_older_than(
+        model,
+        cutoff_date: datetime,
+        batch_size: int = DELETE_BATCH_SIZE,
+        pause: float = 0,
+    ) -> int:
+        """
+        Delete the rows of the model older than the cutoff date in ranges
+        of batch_size primary keys. Every batch is committed separately
+        and followed by a pause, so the write lock is only held briefly
+        and the readers and writers of other processes can run between
+        the batches. Return the number of deleted rows.
+        """
+        first_id, last_id = db_session.execute(
+            select(func.min(model.id), func.max(model.id)).where(
+                model.date < cutoff_date,
             )
+        ).one()
+        if first_id is None:
+            return 0
+        records_deleted = 0
+        for batch_start in range(first_id, last_id + 1, batch_size):
+            records_deleted += db_session.execute(
+                delete(model).where(
+                    model.id >= batch_start,
+                    model.id < batch_start + batch_size,
+                    model.date < cutoff_date,
+                ).execution_options(synchronize_session=False)
+            ).rowcount
             db_session.commit()
+            if pause:
+                time.sleep(pause)
+        return records_deleted
@@ -2,7 +2,16 @@
 from datetime import datetime
 
 # THIRD PARTY
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import declared_attr
 
 # FIRST PARTY
 from rpidash.database import Base
@@ -11,8 +20,11 @@ from rpidash.database import Base
 class CPUTemperature(Base):
     """CPU temperature model."""
     __tablename__ = "cpu_temperature"
+    __table_args__ = (
+        Index("ix_cpu_temperature_date_temperature", "date", "temperature"),
+    )
     id = Column(Integer, primary_key=True)
-    temperature = Column(String(6))
+    temperature = Column(Float)
     date = Column(DateTime())
 
     def __init__(self, temperature=None):
@@ -28,8 +40,11 @@ class CPUTemperature(Base):
 class CPUUtilization(Base):
     """CPU utilization model."""
     __tablename__ = "cpu_utilization"
+    __table_args__ = (
+        Index("ix_cpu_utilization_date_percentage", "date", "percentage"),
+    )
     id = Column(Integer, primary_key=True)
-    percentage = Column(String(6))
+    percentage = Column(Float)
     date = Column(DateTime())
 
     def __init__(self, percentage=None):
@@ -45,8 +60,11 @@ class CPUUtilization(Base):
 class MemoryUtilization(Base):
     """Memory utilization model."""
     __tablename__ = "memory_utilization"
+    __table_args__ = (
+        Index("ix_memory_utilization_date_percentage", "date", "percentage"),
+    )
     id = Column(Integer, primary_key=True)
-    percentage = Column(String(6))
+    percentage = Column(Float)
     date = Column(DateTime())
 
     def __init__(self, percentage=None):
@@ -57,3 +75,69 @@ class MemoryUtilization(Base):
     def get_value_key() -> str:
         """Return the key name for utilization percentage."""
         return "percentage"
+
+
+def create_reading_model(table_name: str, value_key: str) -> type:
+    """
+    Create the model of a metric's readings, with the same columns and
+    index as the models above.
+    """
+    def __init__(self, value=None):
+        setattr(self, value_key, value)
+        self.date = datetime.now()
+
+    return type(
+        "".join(part.title() for part in table_name.split("_")),
+        (Base,),
+        {
+            "__doc__": f"{table_name} reading model.",
+            "__tablename__": table_name,
+            "__table_args__": (
+                Index(f"ix_{table_name}_date_{value_key}", "date", value_key),
+            ),
+            "__init__": __init__,
+            "id": Column(Integer, primary_key=True),
+            value_key: Column(Float),
+            "date": Column(DateTime()),
+            "get_value_key": staticmethod(lambda: value_key),
+        },
+    )
+
+
+class RollupMixin:
+    """
+    Pre-aggregated readings of a metric over fixed time buckets. The
+    average is weighted by the time the readings held for within the
+    bucket, which is kept as its duration in seconds.
+    """
+    resolution = 0
+    id = Column(Integer, primary_key=True)
+    metric = Column(String(32), nullable=False)
+    date = Column(DateTime(), nullable=False)
+    minimum = Column(Float)
+    average = Column(Float)
+    maximum = Column(Float)
+    count = Column(Integer)
+    duration = Column(Float)
+
+    @declared_attr.directive
+    def __table_args__(cls):  # pylint: disable=no-self-argument
+        return (UniqueConstraint("metric", "date"),)
+
+
+class RollupMinute(RollupMixin, Base):
+    """One minute rollup model."""
+    __tablename__ = "rollup_1m"
+    resolution = 60
+
+
+class RollupQuarterHour(RollupMixin, Base):
+    """Fifteen minute rollup model."""
+    __tablename__ = "rollup_15m"
+    resolution = 900
+
+
+class RollupHour(RollupMixin, Base):
+    """One hour rollup model."""
+    __tablename__ = "rollup_1h"
+    resolution = 3600
@@ -0,0 +1,208 @@
+# STDLIB
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# THIRD PARTY
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    event,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql import FromClause
+
+# FIRST PARTY
+from rpidash.database import db_session
+
+PARTITION_PERIODS = {"day": 86400, "week": 604800}
+# Partitions start at midnight, weekly partitions on Mondays
+PARTITION_ORIGIN = datetime(1969, 12, 29)
+
+metadata = MetaData()
+settings = {"period": None}
+# The (schema version, partition starts by table name) read last
+cache = {"partitions": (None, {})}
+
+
+def set_period(period: Optional[str]) -> None:
+    """
+    Set the time period covered by every partition of the metric tables,
+    or disable the partitioning when no period is given.
+    """
+    if period and period not in PARTITION_PERIODS:
+        raise ValueError(
+            "The partition period must be one of: "
+            f"{', '.join(PARTITION_PERIODS)}"
+        )
+    settings["period"] = PARTITION_PERIODS.get(period)
+
+
+def get_partition_start(date: datetime) -> Optional[datetime]:
+    """
+    Return the start of the partition the date belongs to, or None when
+    the partitioning is disabled.
+    """
+    period = settings["period"]
+    if not period:
+        return None
+    seconds = int((date - PARTITION_ORIGIN).total_seconds())
+    return PARTITION_ORIGIN + timedelta(seconds=seconds // period * period)
+
+
+def get_partition_table(model, start: datetime) -> Table:
+    """
+    Return the partition table of the model starting at the given date,
+    with the columns and the index of the model's table.
+    """
+    name = f"{model.__tablename__}_p{start:%Y%m%d}"
+    if name in metadata.tables:
+        return metadata.tables[name]
+    value_key = model.get_value_key()
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column(value_key, Float),
+        Column("date", DateTime()),
+        Index(f"ix_{name}_date_{value_key}", "date", value_key),
+    )
+
+
+def get_schema_version() -> int:
+    """
+    Return the schema version of the database, read once per transaction
+    of the session, i.e. once per request in the web app.
+    """
+    if "schema_version" not in db_session.info:
+        db_session.info["schema_version"] = db_session.execute(
+            text("PRAGMA schema_version"),
+        ).scalar()
+    return db_session.info["schema_version"]
+
+
+@event.listens_for(db_session, "after_transaction_end")
+def reset_schema_version(
+    session: Session,
+    transaction: SessionTransaction,  # pylint: disable=unused-argument
+) -> None:
+    """Read the schema version again in the next transaction."""
+    session.info.pop("schema_version", None)
+
+
+def get_partitions(model) -> List[Tuple[datetime, Table]]:
+    """
+    Return the (start, table) partitions of the model ordered by their
+    start. The partition names are read from the database again only
+    after its schema has changed, e.g. when another process created or
+    dropped a partition. The names are replaced in one step, so that
+    concurrent requests never see a partly read list.
+    """
+    schema_version = get_schema_version()
+    cached_version, starts = cache["partitions"]
+    if schema_version != cached_version:
+        names = db_session.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'table'"),
+        ).scalars().all()
+        starts = {}
+        for name in sorted(names):
+            match = re.fullmatch(r"(\w+)_p(\d{8})", name)
+            if match:
+                starts.setdefault(match.group(1), []).append(
+                    datetime.strptime(match.group(2), "%Y%m%d"),
+                )
+        cache["partitions"] = (schema_version, starts)
+    return [
+        (start, get_partition_table(model, start))
+        for start in starts.get(model.__tablename__, [])
+    ]
+
+
+def get_tables(
+    model,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Table]:
+    """
+    Return the model's table and the partitions overlapping the date
+    range. Every partition covers the dates up to the start of the next
+    one. The model's table keeps the readings stored before the
+    partitioning was enabled, so it is always included.
+    """
+    partitions = get_partitions(model)
+    tables = [model.__table__]
+    for index, (partition_start, table) in enumerate(partitions):
+        next_start = (
+            partitions[index + 1][0] if index + 1 < len(partitions) else None
+        )
+        if end and partition_start > end:
+            continue
+        if start and next_start and next_start <= start:
+            continue
+        tables.append(table)
+    return tables
+
+
+def get_source(
+    model,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> FromClause:
+    """
+    Return the selectable of the model's readings within the date range,
+    the model's table when there are no overlapping partitions or the
+    union of the overlapping tables otherwise.
+    """
+    return combine_tables(model, get_tables(model, start, end))
+
+
+def combine_tables(model, tables: List[Table]) -> FromClause:
+    """Return the selectable of the readings stored in the tables."""
+    if len(tables) == 1:
+        return tables[0]
+    return union_all(*(select(table) for table in tables)).subquery(
+        model.__tablename__,
+    )
+
+
+def get_write_table(model, date: datetime) -> Table:
+    """
+    Return the table storing the model's readings of the given date,
+    creating its partition when it does not exist yet.
+    """
+    start = get_partition_start(date)
+    if not start:
+        return model.__table__
+    for partition_start, table in get_partitions(model):
+        if partition_start == start:
+            return table
+    table = get_partition_table(model, start)
+    table.create(db_session.connection(), checkfirst=True)
+    db_session.info.pop("schema_version", None)
+    return table
+
+
+def drop_expired_partitions(model, cutoff_date: datetime) -> List[str]:
+    """
+    Drop the model's partitions with only readings older than the cutoff
+    date, i.e. those followed by a partition starting before it, without
+    visiting their rows. Return the names of the dropped partitions.
+    """
+    partitions = get_partitions(model)
+    dropped = []
+    for (_, table), (next_start, _) in zip(partitions, partitions[1:]):
+        if next_start > cutoff_date:
+            break
+        table.drop(db_session.connection())
+        metadata.remove(table)
+        dropped.append(table.name)
+    db_session.commit()
+    return dropped
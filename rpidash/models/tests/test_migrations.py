@@ -0,0 +1,120 @@
+# STDLIB
+import unittest
+
+# THIRD PARTY
+from sqlalchemy import create_engine, inspect, text
+
+# FIRST PARTY
+from rpidash.models.migrations import (
+    migrate_auto_vacuum,
+    migrate_rollup_durations,
+    migrate_value_columns,
+)
+
+
+class TestMigrations(unittest.TestCase):
+    """A test suite for the database schema migrations."""
+
+    def setUp(self):
+        """Create a database with the string reading columns."""
+        self.engine = create_engine("sqlite://")
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE cpu_temperature ("
+                "id INTEGER PRIMARY KEY, "
+                "temperature VARCHAR(6), "
+                "date DATETIME)"
+            ))
+            connection.execute(text(
+                "INSERT INTO cpu_temperature (id, temperature, date) "
+                "VALUES (1, '49.5', '2024-01-01 12:00:00.000000')"
+            ))
+
+    def tearDown(self):
+        """Dispose of the database engine."""
+        self.engine.dispose()
+
+    def test_migrate_value_columns(self):
+        """Test string readings are converted to numbers in place."""
+        migrate_value_columns(self.engine)
+
+        inspector = inspect(self.engine)
+        columns = {
+            column["name"]: str(column["type"])
+            for column in inspector.get_columns("cpu_temperature")
+        }
+        self.assertEqual(columns["temperature"], "FLOAT")
+        self.assertEqual(
+            [index["name"] for index in inspector.get_indexes(
+                "cpu_temperature",
+            )],
+            ["ix_cpu_temperature_date_temperature"],
+        )
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT id, temperature, typeof(temperature), date "
+                "FROM cpu_temperature"
+            )).all()
+        self.assertEqual(
+            rows,
+            [(1, 49.5, "real", "2024-01-01 12:00:00.000000")],
+        )
+        self.assertFalse(inspector.has_table("cpu_temperature_old"))
+
+    def test_migrate_value_columns_idempotent(self):
+        """Test migrated and missing tables are left untouched."""
+        migrate_value_columns(self.engine)
+        migrate_value_columns(self.engine)
+
+        with self.engine.connect() as connection:
+            count = connection.execute(text(
+                "SELECT count(*) FROM cpu_temperature"
+            )).scalar()
+        self.assertEqual(count, 1)
+
+    def test_migrate_rollup_durations(self):
+        """Test existing rollup rows are counted as whole buckets."""
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE rollup_1m ("
+                "id INTEGER PRIMARY KEY, "
+                "metric VARCHAR(32), "
+                "date DATETIME, "
+                "minimum FLOAT, "
+                "average FLOAT, "
+                "maximum FLOAT, "
+                "count INTEGER)"
+            ))
+            connection.execute(text(
+                "INSERT INTO rollup_1m VALUES "
+                "(1, 'cpu_temperature', '2024-01-01 12:00:00.000000', "
+                "40.0, 50.0, 60.0, 2)"
+            ))
+        migrate_rollup_durations(self.engine)
+        migrate_rollup_durations(self.engine)
+
+        with self.engine.connect() as connection:
+            duration = connection.execute(text(
+                "SELECT duration FROM rollup_1m"
+            )).scalar()
+        self.assertEqual(duration, 60)
+        self.assertFalse(inspect(self.engine).has_table("rollup_1h"))
+
+    def test_migrate_auto_vacuum(self):
+        """Test the database is switched to incremental auto-vacuum."""
+        migrate_auto_vacuum(self.engine)
+        migrate_auto_vacuum(self.engine)
+
+        with self.engine.connect() as connection:
+            auto_vacuum = connection.execute(text(
+                "PRAGMA auto_vacuum"
+            )).scalar()
+            count = connection.execute(text(
+                "SELECT count(*) FROM cpu_temperature"
+            )).scalar()
+        self.assertEqual(auto_vacuum, 2)
+        self.assertEqual(count, 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
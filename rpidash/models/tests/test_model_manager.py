@@ -4,7 +4,14 @@ from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 # FIRST PARTY
-from rpidash.models.model_manager import ModelManager
+from rpidash import create_app
+from rpidash.database import db_session
+from rpidash.models.model_manager import (
+    ModelManager,
+    decode_cursor,
+    encode_cursor,
+)
+from rpidash.models.models import CPUTemperature, RollupHour, RollupMinute
 
 
 class TestModelManager(unittest.TestCase):
@@ -52,45 +59,87 @@ class TestModelManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             manager.get_model("non_existent_table")
 
+    @patch("rpidash.models.model_manager.partitions")
+    @patch("rpidash.models.model_manager.select")
+    @patch("rpidash.models.model_manager.db_session")
     @patch("rpidash.models.model_manager.ModelManager.get_models")
-    def test_retrieve_data_no_filter(self, mock_get_models):
+    def test_retrieve_data_no_filter(
+        self,
+        mock_get_models,
+        mock_db_session,
+        mock_select,
+        mock_partitions,
+    ):  # pylint: disable=unused-argument
         """Test retrieve_data method without recorded_after filter."""
         mock_get_models.return_value = self.models
         manager = ModelManager("cpu_temperature")
 
-        mock_data = [
-            MagicMock(date=datetime(2024, 1, 1, 12, 0, 0), temperature=50),
-            MagicMock(date=datetime(2024, 1, 2, 12, 0, 0), temperature=55),
+        mock_db_session.execute.return_value.all.return_value = [
+            ("2024-01-01T12:00:00", 50, "2024-01-01 12:00:00.000000", 1),
+            ("2024-01-02T12:00:00", 55, "2024-01-02 12:00:00.000000", 2),
         ]
-        manager.model.query.all.return_value = mock_data
 
         data = manager.retrieve_data()
         expected_data = {
             "values": [50, 55],
             "dates": ["2024-01-01T12:00:00", "2024-01-02T12:00:00"],
+            "next_cursor": None,
         }
         self.assertEqual(data, expected_data)
 
+    @patch("rpidash.models.model_manager.partitions")
+    @patch("rpidash.models.model_manager.select")
+    @patch("rpidash.models.model_manager.db_session")
     @patch("rpidash.models.model_manager.ModelManager.get_models")
-    def test_retrieve_data_with_filter(self, mock_get_models):
+    def test_retrieve_data_with_filter(
+        self,
+        mock_get_models,
+        mock_db_session,
+        mock_select,
+        mock_partitions,
+    ):  # pylint: disable=unused-argument
         """Test retrieve_data method with recorded_after filter."""
         mock_get_models.return_value = self.models
         manager = ModelManager("cpu_temperature")
 
-        mock_data = [
-            MagicMock(date=datetime(2024, 1, 1, 12, 0, 0), temperature=50),
-            MagicMock(date=datetime(2024, 1, 2, 12, 0, 0), temperature=55),
+        mock_db_session.execute.return_value.all.return_value = [
+            ("2024-01-01T12:00:00", 50, "2024-01-01 12:00:00.000000", 1),
+            ("2024-01-02T12:00:00", 55, "2024-01-02 12:00:00.000000", 2),
         ]
-        manager.model.query.filter.return_value.all.return_value = mock_data
 
+        mock_partitions.get_source.return_value.c.date = datetime(2024, 1, 2)
         recorded_after = "2024-01-01T00:00:00"
         data = manager.retrieve_data(recorded_after=recorded_after)
         expected_data = {
             "values": [50, 55],
             "dates": ["2024-01-01T12:00:00", "2024-01-02T12:00:00"],
+            "next_cursor": None,
         }
         self.assertEqual(data, expected_data)
 
+    @patch("rpidash.models.model_manager.partitions")
+    @patch("rpidash.models.model_manager.select")
+    @patch("rpidash.models.model_manager.db_session")
+    @patch("rpidash.models.model_manager.ModelManager.get_models")
+    def test_retrieve_data_empty(
+        self,
+        mock_get_models,
+        mock_db_session,
+        mock_select,
+        mock_partitions,
+    ):  # pylint: disable=unused-argument
+        """Test retrieve_data method without any stored readings."""
+        mock_get_models.return_value = self.models
+        manager = ModelManager("cpu_temperature")
+
+        mock_db_session.execute.return_value.all.return_value = []
+
+        data = manager.retrieve_data()
+        self.assertEqual(
+            data,
+            {"values": [], "dates": [], "next_cursor": None},
+        )
+
     @patch("rpidash.models.model_manager.ModelManager.get_models")
     def test_retrieve_data_invalid_date(self, mock_get_models):
         """Test retrieve_data method with invalid recorded_after date."""
@@ -100,47 +149,398 @@ class TestModelManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             manager.retrieve_data(recorded_after="invalid_date")
 
-    @patch("rpidash.models.model_manager.db_session")
     @patch("rpidash.models.model_manager.ModelManager.get_models")
-    def test_store_record(self, mock_get_models, mock_db_session):
-        """Test store_record method."""
+    def test_retrieve_data_invalid_bucket(self, mock_get_models):
+        """Test retrieve_data method with an unsupported bucket."""
         mock_get_models.return_value = self.models
         manager = ModelManager("cpu_temperature")
 
-        manager.store_record(50)
-        instance = manager.model()
-        setattr(instance, "temperature", 50)
-        mock_db_session.add.assert_called_with(instance)
-        mock_db_session.commit.assert_called_once()
+        with self.assertRaises(ValueError):
+            manager.retrieve_data(bucket="2d")
 
-    @patch("rpidash.models.model_manager.db_session")
     @patch("rpidash.models.model_manager.ModelManager.get_models")
-    def test_delete_records(self, mock_get_models, mock_db_session):
-        """Test delete_records method."""
+    def test_retrieve_data_invalid_max_points(self, mock_get_models):
+        """Test retrieve_data method with invalid max_points values."""
         mock_get_models.return_value = self.models
-        manager = ModelManager()
+        manager = ModelManager("cpu_temperature")
+
+        with self.assertRaises(ValueError):
+            manager.retrieve_data(max_points="many")
+        with self.assertRaises(ValueError):
+            manager.retrieve_data(max_points="0")
+
+    @patch("rpidash.models.model_manager.ModelManager.get_models")
+    def test_retrieve_data_invalid_cursor(self, mock_get_models):
+        """Test retrieve_data method with invalid cursors."""
+        mock_get_models.return_value = self.models
+        manager = ModelManager("cpu_temperature")
+
+        with self.assertRaises(ValueError):
+            manager.retrieve_data(cursor="invalid")
+        with self.assertRaises(ValueError):
+            manager.retrieve_data(
+                cursor=encode_cursor(datetime.now(), 1),
+                bucket="1m",
+            )
+
+    def test_encode_cursor(self):
+        """Test cursors are decoded into the encoded date and row id."""
+        date = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        self.assertEqual(decode_cursor(encode_cursor(date, 42)), (date, 42))
+
+    def test_transpose_empty(self):
+        """Test every column of empty rows is a separate list."""
+        dates, values = ModelManager.transpose([], 2)
+        dates.append("2024-01-01T12:00:00")
+        self.assertEqual(values, [])
+
+    @patch("rpidash.models.model_manager.ModelManager.get_models")
+    def test_get_bucket_seconds_from_max_points(self, mock_get_models):
+        """Test get_bucket_seconds derives the size from the time range."""
+        mock_get_models.return_value = self.models
+        manager = ModelManager("cpu_temperature")
+
+        bucket_seconds, origin = manager.get_bucket_seconds(
+            max_points="100",
+            start=datetime(2024, 1, 1, 0, 0, 0),
+            end=datetime(2024, 1, 2, 0, 0, 0),
+        )
+        self.assertEqual(bucket_seconds, 864)
+        self.assertEqual(origin, datetime(2024, 1, 1, 0, 0, 0))
+        self.assertEqual(manager.get_bucket_seconds(bucket="1h"), (3600, None))
+
+    @patch("rpidash.models.model_manager.ModelManager.store_records")
+    @patch("rpidash.models.model_manager.ModelManager.get_models")
+    def test_store_record(self, mock_get_models, mock_store_records):
+        """Test store_record method."""
+        mock_get_models.return_value = self.models
+        manager = ModelManager("cpu_temperature")
+
+        manager.store_record(50)
+        (records,), _ = mock_store_records.call_args
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0][0], "cpu_temperature")
+        self.assertEqual(records[0][2], 50)
+
+
+class TestModelManagerAggregation(unittest.TestCase):
+    """A test suite for the time-bucketed aggregation queries."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test environment."""
+        cls.app = create_app()
+        cls.context = cls.app.app_context()
+        cls.context.push()
+
+    def setUp(self):
+        """Store readings spread over two minutes and their rollups."""
+        self.delete_readings()
+        readings = [
+            (datetime(2024, 1, 1, 12, 0, 0), 40.0),
+            (datetime(2024, 1, 1, 12, 0, 30), 60.0),
+            (datetime(2024, 1, 1, 12, 1, 10), 9.0),
+            (datetime(2024, 1, 1, 12, 1, 50), 11.0),
+        ]
+        for date, temperature in readings:
+            instance = CPUTemperature(temperature=temperature)
+            instance.date = date
+            db_session.add(instance)
+        db_session.commit()
+        ModelManager().backfill_rollups()
+
+    def tearDown(self):
+        """Remove the stored readings."""
+        db_session.rollback()
+        self.delete_readings()
+
+    @staticmethod
+    def delete_readings():
+        """Delete the CPU temperature readings and rollups."""
+        CPUTemperature.query.delete()
+        for model in ModelManager.get_rollup_models().values():
+            model.query.delete()
+        db_session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the test environment."""
+        cls.context.pop()
+
+    def test_retrieve_data_bucket(self):
+        """Test retrieve_data aggregates readings into minute buckets."""
+        data = ModelManager("cpu_temperature").retrieve_data(bucket="1m")
+        self.assertEqual(
+            data,
+            {
+                "values": [50.0, 19.2],
+                "min": [40.0, 9.0],
+                "max": [60.0, 60.0],
+                "dates": ["2024-01-01T12:00:00", "2024-01-01T12:01:00"],
+            },
+        )
+
+    def test_retrieve_data_max_points(self):
+        """Test retrieve_data returns at most max_points buckets."""
+        data = ModelManager("cpu_temperature").retrieve_data(
+            start="2024-01-01T12:00:00",
+            end="2024-01-01T12:02:00",
+            max_points="1",
+        )
+        self.assertEqual(data["values"], [36.0])
+        self.assertEqual(data["min"], [9.0])
+        self.assertEqual(data["max"], [60.0])
+
+    def test_retrieve_data_raw_buckets(self):
+        """Test retrieve_data aggregates raw readings into small buckets."""
+        data = ModelManager("cpu_temperature").retrieve_data(
+            start="2024-01-01T12:00:00",
+            end="2024-01-01T12:02:00",
+            max_points="4",
+        )
+        self.assertEqual(data["values"], [40.0, 60.0, 26.0, 9.0])
+        self.assertEqual(
+            data["dates"],
+            [
+                "2024-01-01T12:00:00",
+                "2024-01-01T12:00:30",
+                "2024-01-01T12:01:00",
+                "2024-01-01T12:01:30",
+            ],
+        )
 
-        older_than = 3600
-        cutoff_date = datetime.now() - timedelta(seconds=older_than)
+    def test_retrieve_data_max_points_unaligned(self):
+        """Test max_points bounds ranges not starting on a bucket."""
+        manager = ModelManager("cpu_temperature")
+        data = manager.retrieve_data(
+            start="2024-01-01T12:00:10",
+            end="2024-01-01T12:01:50",
+            max_points="4",
+        )
+        self.assertEqual(
+            data["dates"],
+            [
+                "2024-01-01T12:00:10",
+                "2024-01-01T12:00:35",
+                "2024-01-01T12:01:00",
+                "2024-01-01T12:01:25",
+            ],
+        )
+
+        manager.store_records([
+            ("cpu_temperature", datetime(2024, 1, 1, hour, 30, 0), 20.0)
+            for hour in range(12, 22)
+        ])
+        data = manager.retrieve_data(
+            start="2024-01-01T12:30:00",
+            end="2024-01-01T21:30:00",
+            max_points="3",
+        )
+        self.assertEqual(
+            data["dates"],
+            [
+                "2024-01-01T13:00:00",
+                "2024-01-01T16:00:00",
+                "2024-01-01T19:00:00",
+            ],
+        )
 
-        manager.delete_records(older_than)
+    def test_update_rollups(self):
+        """Test update_rollups merges readings into existing buckets."""
+        ModelManager().update_rollups(
+            [("cpu_temperature", datetime(2024, 1, 1, 12, 1, 59), 16.0)],
+        )
+        db_session.commit()
+        rollup = RollupMinute.query.filter(
+            RollupMinute.metric == "cpu_temperature",
+            RollupMinute.date == datetime(2024, 1, 1, 12, 1, 0),
+        ).one()
+        self.assertEqual(rollup.minimum, 9.0)
+        self.assertAlmostEqual(rollup.average, (19.2 * 50 + 11.0 * 9) / 59)
+        self.assertEqual(rollup.maximum, 60.0)
+        self.assertEqual(rollup.count, 3)
+        self.assertEqual(rollup.duration, 59)
 
-        self.mock_cpu_temperature.query.filter.assert_called_with(
-            self.mock_cpu_temperature.date < cutoff_date,
+    def test_store_records(self):
+        """Test store_records writes readings and rollups in one batch."""
+        ModelManager().store_records([
+            ("cpu_temperature", datetime(2024, 1, 1, 12, 2, 0), 20.0),
+            ("cpu_temperature", datetime(2024, 1, 1, 12, 2, 10), 30.0),
+        ])
+        data = ModelManager("cpu_temperature").retrieve_data(
+            start="2024-01-01T12:02:00",
         )
-        self.mock_cpu_temperature.query.filter().delete.assert_called_once()
+        self.assertEqual(data["values"], [20.0, 30.0])
+        rollup = RollupMinute.query.filter(
+            RollupMinute.metric == "cpu_temperature",
+            RollupMinute.date == datetime(2024, 1, 1, 12, 2, 0),
+        ).one()
+        self.assertEqual(rollup.average, 20.0)
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.duration, 10)
+
+    def test_rollups_time_weighted(self):
+        """Test the rollups weigh unevenly spaced readings by time."""
+        records = [
+            ("cpu_temperature", datetime(2024, 1, 1, 13, minute, 0), 10.0)
+            for minute in range(0, 55, 5)
+        ] + [
+            (
+                "cpu_temperature",
+                datetime(2024, 1, 1, 13, 55, 0) + timedelta(seconds=second),
+                40.0,
+            )
+            for second in range(0, 300, 10)
+        ] + [("cpu_temperature", datetime(2024, 1, 1, 14, 0, 0), 10.0)]
+        manager = ModelManager("cpu_temperature")
+        manager.store_records(records)
+        stored = [
+            manager.retrieve_data(bucket=bucket, start="2024-01-01T13:00:00")
+            for bucket in ("1h", "1m")
+        ]
+        self.assertEqual(stored[0]["values"], [12.5, 10.0])
+        self.assertEqual(len(stored[1]["values"]), 61)
+        self.assertEqual(stored[1]["values"][:55], [10.0] * 55)
+        self.assertEqual(stored[1]["values"][55:60], [40.0] * 5)
 
-        self.mock_cpu_utilization.query.filter.assert_called_with(
-            self.mock_cpu_temperature.date < cutoff_date,
+        for model in ModelManager.get_rollup_models().values():
+            model.query.delete()
+        manager.backfill_rollups()
+        self.assertEqual(
+            [
+                manager.retrieve_data(
+                    bucket=bucket,
+                    start="2024-01-01T13:00:00",
+                )
+                for bucket in ("1h", "1m")
+            ],
+            stored,
         )
-        self.mock_cpu_utilization.query.filter().delete.assert_called_once()
 
-        self.mock_memory_utilization.query.filter.assert_called_with(
-            self.mock_cpu_temperature.date < cutoff_date,
+    def test_retrieve_data_epoch_dates(self):
+        """Test retrieve_data formats the dates as epoch seconds."""
+        manager = ModelManager("cpu_temperature")
+        data = manager.retrieve_data(
+            start="2024-01-01T12:01:00",
+            epoch_dates=True,
         )
-        self.mock_memory_utilization.query.filter().delete.assert_called_once()
+        self.assertEqual(data["dates"], [1704110470, 1704110510])
+        data = manager.retrieve_data(bucket="1m", epoch_dates=True)
+        self.assertEqual(data["dates"], [1704110400, 1704110460])
 
-        mock_db_session.commit.assert_called()
+    def test_retrieve_data_pages(self):
+        """Test the raw readings are returned in pages with cursors."""
+        manager = ModelManager("cpu_temperature")
+        data = manager.retrieve_data(page_size="3")
+        self.assertEqual(data["values"], [40.0, 60.0, 9.0])
+        self.assertIsNotNone(data["next_cursor"])
+
+        data = manager.retrieve_data(
+            page_size="3",
+            cursor=data["next_cursor"],
+        )
+        self.assertEqual(data["values"], [11.0])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_retrieve_data_range(self):
+        """Test retrieve_data returns raw readings within the range."""
+        data = ModelManager("cpu_temperature").retrieve_data(
+            start="2024-01-01T12:00:10",
+            end="2024-01-01T12:01:10",
+        )
+        self.assertEqual(
+            data["dates"],
+            ["2024-01-01T12:00:30", "2024-01-01T12:01:10"],
+        )
+
+    def test_iterate_chunks(self):
+        """Test the exported readings are fetched in chunks."""
+        manager = ModelManager("cpu_temperature")
+        statement = manager.export_statement(start="2024-01-01T12:00:10")
+        manager.store_records(
+            [("cpu_temperature", datetime(2024, 1, 1, 12, 2, 0), 20.0)],
+        )
+        chunks = list(manager.iterate_chunks(statement, chunk_size=2))
+        self.assertEqual(
+            [[tuple(row) for row in chunk] for chunk in chunks],
+            [
+                [("2024-01-01T12:00:30", 60.0), ("2024-01-01T12:01:10", 9.0)],
+                [("2024-01-01T12:01:50", 11.0)],
+            ],
+        )
+
+    def test_get_cache_validators(self):
+        """Test the validators change when readings are stored."""
+        manager = ModelManager("cpu_temperature")
+        validators, last_modified = manager.get_cache_validators()
+        self.assertEqual(last_modified, datetime(2024, 1, 1, 12, 1, 50))
+        self.assertEqual(manager.get_cache_validators()[0], validators)
+
+        manager.store_records(
+            [("cpu_temperature", datetime(2024, 1, 1, 12, 2, 0), 20.0)],
+        )
+        self.assertNotEqual(manager.get_cache_validators()[0], validators)
+
+    def test_delete_records(self):
+        """Test old records and rollup rows are deleted in batches."""
+        manager = ModelManager()
+        with patch("rpidash.models.model_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 12, 2, 0)
+            manager.delete_records(
+                60,
+                rollup_retention={"1m": 60},
+                batch_size=1,
+            )
+        data = ModelManager("cpu_temperature").retrieve_data()
+        self.assertEqual(data["values"], [9.0, 11.0])
+        self.assertEqual(
+            [
+                rollup.date for rollup in RollupMinute.query.filter(
+                    RollupMinute.metric == "cpu_temperature",
+                )
+            ],
+            [datetime(2024, 1, 1, 12, 1, 0)],
+        )
+        self.assertEqual(
+            RollupHour.query.filter(
+                RollupHour.metric == "cpu_temperature",
+            ).count(),
+            1,
+        )
+
+    def test_delete_records_default_rollup_retention(self):
+        """Test rollup rows without a configured retention expire."""
+        with patch("rpidash.models.model_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 9)
+            ModelManager().delete_records(86400 * 30)
+        self.assertEqual(
+            RollupMinute.query.filter(
+                RollupMinute.metric == "cpu_temperature",
+            ).count(),
+            0,
+        )
+        self.assertEqual(
+            RollupHour.query.filter(
+                RollupHour.metric == "cpu_temperature",
+            ).count(),
+            1,
+        )
+
+    def test_delete_older_than(self):
+        """Test the number of deleted rows is returned."""
+        deleted = ModelManager.delete_older_than(
+            CPUTemperature,
+            datetime(2024, 1, 1, 12, 1, 0),
+            batch_size=3,
+        )
+        self.assertEqual(deleted, 2)
+        self.assertEqual(
+            ModelManager.delete_older_than(
+                CPUTemperature,
+                datetime(2024, 1, 1, 12, 1, 0),
+            ),
+            0,
+        )
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -33,35 +33,35 @@ class TestModels(unittest.TestCase):
 
     def test_create_and_query_cpu_temperature(self):
         """Test creating a CPUTemperature instance and querying it."""
-        cpu_temp = CPUTemperature(temperature="49.00")
+        cpu_temp = CPUTemperature(temperature=49.0)
         db_session.add(cpu_temp)
         db_session.commit()
         result = db_session.query(CPUTemperature).filter_by(
-            temperature="49.00",
+            temperature=49.0,
         ).first()
-        self.assertEqual(result.temperature, "49.00")
+        self.assertEqual(result.temperature, 49.0)
         self.assertIsInstance(result.date, datetime)
 
     def test_create_and_query_cpu_utilization(self):
         """Test creating a CPUUtilization instance and querying it."""
-        cpu_percent = CPUUtilization(percentage="50.00")
+        cpu_percent = CPUUtilization(percentage=50.0)
         db_session.add(cpu_percent)
         db_session.commit()
         result = db_session.query(CPUUtilization).filter_by(
-            percentage="50.00",
+            percentage=50.0,
         ).first()
-        self.assertEqual(result.percentage, "50.00")
+        self.assertEqual(result.percentage, 50.0)
         self.assertIsInstance(result.date, datetime)
 
     def test_create_and_query_memory_utilization(self):
         """Test creating a MemoryUtilization instance and querying it."""
-        mempory_percent = MemoryUtilization(percentage="51.00")
+        mempory_percent = MemoryUtilization(percentage=51.0)
         db_session.add(mempory_percent)
         db_session.commit()
         result = db_session.query(MemoryUtilization).filter_by(
-            percentage="51.00",
+            percentage=51.0,
         ).first()
-        self.assertEqual(result.percentage, "51.00")
+        self.assertEqual(result.percentage, 51.0)
         self.assertIsInstance(result.date, datetime)
 
 
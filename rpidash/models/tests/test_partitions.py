@@ -0,0 +1,154 @@
+# STDLIB
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+# FIRST PARTY
+from rpidash import create_app
+from rpidash.database import db_session
+from rpidash.models import partitions
+from rpidash.models.model_manager import ModelManager
+from rpidash.models.models import CPUTemperature
+
+
+class TestPartitions(unittest.TestCase):
+    """A test suite for the time-partitioned reading tables."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test environment."""
+        cls.app = create_app()
+        cls.context = cls.app.app_context()
+        cls.context.push()
+
+    def setUp(self):
+        """Store readings of two days into daily partitions."""
+        CPUTemperature.query.delete()
+        db_session.commit()
+        partitions.set_period("day")
+        self.manager = ModelManager("cpu_temperature")
+        self.manager.store_records([
+            ("cpu_temperature", datetime(2024, 1, 1, 23, 59, 0), 40.0),
+            ("cpu_temperature", datetime(2024, 1, 2, 0, 0, 0), 50.0),
+            ("cpu_temperature", datetime(2024, 1, 2, 0, 1, 0), 60.0),
+        ])
+
+    def tearDown(self):
+        """Drop the partitions and remove the stored rollups."""
+        db_session.rollback()
+        for _, table in partitions.get_partitions(CPUTemperature):
+            table.drop(db_session.connection())
+            partitions.metadata.remove(table)
+        for model in ModelManager.get_rollup_models().values():
+            model.query.delete()
+        db_session.commit()
+        partitions.set_period(None)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the test environment."""
+        cls.context.pop()
+
+    def test_set_period_invalid(self):
+        """Test unknown partition periods are rejected."""
+        with self.assertRaises(ValueError):
+            partitions.set_period("month")
+
+    def test_get_partition_start(self):
+        """Test weekly partitions start on Mondays at midnight."""
+        partitions.set_period("week")
+        self.assertEqual(
+            partitions.get_partition_start(datetime(2024, 1, 10, 12, 0, 0)),
+            datetime(2024, 1, 8),
+        )
+
+    def test_store_records(self):
+        """Test readings are stored into the partitions of their dates."""
+        self.assertEqual(
+            [start for start, _ in partitions.get_partitions(CPUTemperature)],
+            [datetime(2024, 1, 1), datetime(2024, 1, 2)],
+        )
+        self.assertEqual(CPUTemperature.query.count(), 0)
+        data = self.manager.retrieve_data()
+        self.assertEqual(data["values"], [40.0, 50.0, 60.0])
+
+    def test_get_partitions_schema_version(self):
+        """
+        Test the schema version is read once per transaction and that
+        partitions created by another connection are found after it.
+        """
+        partitions.get_partitions(CPUTemperature)
+        db_session.commit()
+        with patch.object(
+            db_session,
+            "execute",
+            wraps=db_session.execute,
+        ) as mock_execute:
+            partitions.get_partitions(CPUTemperature)
+            partitions.get_partitions(CPUTemperature)
+        self.assertEqual(mock_execute.call_count, 1)
+
+        with db_session.get_bind().begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE cpu_temperature_p20240103 "
+                "(id INTEGER PRIMARY KEY, temperature FLOAT, date DATETIME)"
+            )
+        self.assertEqual(len(partitions.get_partitions(CPUTemperature)), 2)
+        db_session.commit()
+        self.assertEqual(
+            [start for start, _ in partitions.get_partitions(CPUTemperature)],
+            [datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 3)],
+        )
+
+    def test_get_tables(self):
+        """Test only the partitions overlapping the range are read."""
+        tables = partitions.get_tables(
+            CPUTemperature,
+            start=datetime(2024, 1, 2, 0, 0, 30),
+        )
+        self.assertEqual(
+            [table.name for table in tables],
+            ["cpu_temperature", "cpu_temperature_p20240102"],
+        )
+        tables = partitions.get_tables(
+            CPUTemperature,
+            end=datetime(2024, 1, 1, 23, 59, 59),
+        )
+        self.assertEqual(
+            [table.name for table in tables],
+            ["cpu_temperature", "cpu_temperature_p20240101"],
+        )
+
+    def test_retrieve_data_pages(self):
+        """Test the pages continue across the partitions."""
+        data = self.manager.retrieve_data(page_size="1")
+        self.assertEqual(data["values"], [40.0])
+        data = self.manager.retrieve_data(
+            page_size="2",
+            cursor=data["next_cursor"],
+        )
+        self.assertEqual(data["values"], [50.0, 60.0])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_retrieve_data_aggregated(self):
+        """Test the readings held across the partitions are aggregated."""
+        data = self.manager.retrieve_data(
+            start="2024-01-01T23:59:00",
+            end="2024-01-02T00:01:00",
+            max_points="4",
+        )
+        self.assertEqual(data["values"], [40.0, 40.0, 50.0, 50.0])
+
+    def test_drop_expired_partitions(self):
+        """Test only partitions followed by an expired one are dropped."""
+        dropped = partitions.drop_expired_partitions(
+            CPUTemperature,
+            datetime(2024, 1, 3),
+        )
+        self.assertEqual(dropped, ["cpu_temperature_p20240101"])
+        data = self.manager.retrieve_data()
+        self.assertEqual(data["values"], [50.0, 60.0])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
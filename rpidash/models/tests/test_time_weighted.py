@@ -0,0 +1,48 @@
+# STDLIB
+import unittest
+
+# FIRST PARTY
+from rpidash.models.time_weighted import MAX_HOLD, TimeWeightedBuckets
+
+
+class TestTimeWeightedBuckets(unittest.TestCase):
+    """A test suite for the time-weighted bucket aggregates."""
+
+    def test_rows_time_weighted(self):
+        """Test readings are weighted by the time they hold for."""
+        buckets = TimeWeightedBuckets(60)
+        buckets.add(0, 10.0)
+        for timestamp in range(50, 60):
+            buckets.add(timestamp, 40.0)
+        buckets.add(60, 10.0)
+        self.assertEqual(
+            list(buckets.rows()),
+            [(0, 10.0, 15.0, 40.0, 11, 60.0), (60, 10.0, 10.0, 10.0, 1, 0.0)],
+        )
+
+    def test_rows_fill_buckets(self):
+        """Test the held value fills the buckets without readings."""
+        buckets = TimeWeightedBuckets(60, previous=(30, 20.0))
+        buckets.add(150, 30.0)
+        self.assertEqual(
+            list(buckets.rows()),
+            [
+                (0, 20.0, 20.0, 20.0, 0, 30.0),
+                (60, 20.0, 20.0, 20.0, 0, 60.0),
+                (120, 20.0, 20.0, 30.0, 1, 30.0),
+            ],
+        )
+
+    def test_rows_max_hold(self):
+        """Test a reading holds for at most MAX_HOLD seconds."""
+        buckets = TimeWeightedBuckets(MAX_HOLD)
+        buckets.add(0, 20.0)
+        buckets.add(MAX_HOLD * 3, 30.0)
+        self.assertEqual(
+            [row[0] for row in buckets.rows()],
+            [0, MAX_HOLD * 3],
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,84 @@
+# STDLIB
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAX_HOLD = 900
+
+
+class TimeWeightedBuckets:
+    """
+    Time-weighted aggregates of a step-shaped series of readings over
+    fixed time buckets, aligned to the origin timestamp. Every reading
+    holds its value until the next one, for at most MAX_HOLD seconds,
+    and the time it holds for is split between the buckets it covers. A
+    steady stretch stored as a few readings thus weighs as much as a
+    volatile one of the same length, and the buckets it covers without
+    readings of their own are filled. The newest reading only counts
+    towards the extremes of its bucket until the next one is added.
+    """
+
+    def __init__(
+        self,
+        resolution: int,
+        previous: Optional[Tuple[float, float]] = None,
+        origin: float = 0,
+    ):
+        self.resolution = resolution
+        self.origin = origin
+        self.previous = previous
+        # The minimum, maximum, count, sum, held seconds and time-weighted
+        # sum of the readings by bucket start
+        self.buckets: Dict[int, List[float]] = {}
+
+    def get_bucket(self, timestamp: float, reading: float) -> List[float]:
+        """Return the bucket of the timestamp, extended by the reading."""
+        start = int(
+            (timestamp - self.origin) // self.resolution * self.resolution
+            + self.origin
+        )
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = [reading, reading, 0, 0.0, 0.0, 0.0]
+        else:
+            bucket[0] = min(bucket[0], reading)
+            bucket[1] = max(bucket[1], reading)
+        return bucket
+
+    def hold(self, start: float, end: float, reading: float) -> None:
+        """Spread the reading held from start to end over its buckets."""
+        while start < end:
+            bucket = self.get_bucket(start, reading)
+            stop = min(
+                end,
+                ((start - self.origin) // self.resolution + 1)
+                * self.resolution + self.origin,
+            )
+            bucket[4] += stop - start
+            bucket[5] += reading * (stop - start)
+            start = stop
+
+    def add(self, timestamp: float, reading: float) -> None:
+        """Add the reading taken after the previous one at the timestamp."""
+        if self.previous:
+            previous_timestamp, previous_reading = self.previous
+            self.hold(
+                previous_timestamp,
+                min(timestamp, previous_timestamp + MAX_HOLD),
+                previous_reading,
+            )
+        bucket = self.get_bucket(timestamp, reading)
+        bucket[2] += 1
+        bucket[3] += reading
+        self.previous = (timestamp, reading)
+
+    def rows(self) -> Iterator[Tuple[int, float, float, float, int, float]]:
+        """
+        Yield the (start, minimum, average, maximum, count, held seconds)
+        rows of the buckets ordered by their start. The average of a
+        bucket no reading held for yet is the mean of its readings.
+        """
+        for start in sorted(self.buckets):
+            minimum, maximum, count, total, duration, weighted = (
+                self.buckets[start]
+            )
+            average = weighted / duration if duration else total / count
+            yield start, minimum, average, maximum, count, duration
@@ -0,0 +1,49 @@
+# STDLIB
+from typing import Dict, Optional
+
+
+class AdaptiveInterval:
+    """
+    A sampling interval adapting to the volatility of the readings. It
+    drops to the minimum as soon as a reading changes by more than its
+    metric's threshold between two samples, and doubles up to the maximum
+    while all readings stay within their metric's dead-band. The
+    thresholds are set per metric, as the metrics are read in different
+    units, and metrics without settings don't affect the interval.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+        settings: Optional[Dict[str, dict]] = None,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.settings = settings or {}
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.previous: Dict[str, float] = {}
+
+    def update(self, readings: Dict[str, float]) -> float:
+        """
+        Return the interval until the next sample after the readings of
+        the metrics were sampled.
+        """
+        changes = [
+            (abs(reading - self.previous[name]), self.settings[name])
+            for name, reading in readings.items()
+            if name in self.settings and name in self.previous
+        ]
+        self.previous.update(readings)
+        if any(
+            change > settings.get("threshold", float("inf"))
+            for change, settings in changes
+        ):
+            self.interval = self.min_interval
+        elif changes and all(
+            change <= settings.get("deadband", 0)
+            for change, settings in changes
+        ):
+            self.interval = min(self.interval * 2, self.max_interval)
+        return self.interval
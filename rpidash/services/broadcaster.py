@@ -0,0 +1,108 @@
+# STDLIB
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# THIRD PARTY
+from sqlalchemy.exc import SQLAlchemyError
+
+# FIRST PARTY
+from rpidash.database import db_session
+from rpidash.models.model_manager import DATE_FORMAT, ModelManager
+from rpidash.services.ring_buffer import RecentReadings
+from rpidash.services.utilization_snapshot import UtilizationSnapshot
+
+
+class Broadcaster:
+    """
+    Fans out the new readings and the current utilization to all stream
+    subscribers of the process. A single thread polls the database once
+    per interval while there are subscribers, regardless of their number.
+    The new readings are read through the recent readings, if given.
+    """
+
+    def __init__(
+        self,
+        snapshot: UtilizationSnapshot,
+        interval: float = 10,
+        max_queue_size: int = 10,
+        recent: Optional[RecentReadings] = None,
+    ):
+        self.snapshot = snapshot
+        self.recent = recent
+        self.interval = interval
+        self.max_queue_size = max_queue_size
+        self.subscribers: List[queue.Queue] = []
+        self.latest_dates: Dict[str, Optional[str]] = {}
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """Add a subscriber and start polling if it is the first one."""
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self.lock:
+            self.subscribers.append(subscriber)
+            if self.thread is None:
+                self.latest_dates = dict.fromkeys(
+                    ModelManager.get_models(),
+                    datetime.now().strftime(DATE_FORMAT),
+                )
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a subscriber."""
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+    def run(self) -> None:
+        """Publish a message every interval until nobody is subscribed."""
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None
+                    return
+            try:
+                self.publish(self.collect())
+            except SQLAlchemyError as exc:
+                logging.error("Couldn't collect stream readings: %s", exc)
+            finally:
+                db_session.remove()
+
+    def collect(self) -> dict:
+        """
+        Collect the readings stored since the previous poll and the
+        current utilization.
+        """
+        readings = {}
+        for table_name, latest_date in self.latest_dates.items():
+            data = None
+            if self.recent:
+                data = self.recent.get(table_name, recorded_after=latest_date)
+            if data is None:
+                data = ModelManager(table_name).retrieve_data(
+                    recorded_after=latest_date,
+                )
+            if data["dates"]:
+                self.latest_dates[table_name] = data["dates"][-1]
+            readings[table_name] = data
+        return {
+            "utilization": self.snapshot.get(),
+            "readings": readings,
+        }
+
+    def publish(self, message: dict) -> None:
+        """Queue the message for every subscriber, skipping full queues."""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                logging.debug("Skipping message for a slow stream client")
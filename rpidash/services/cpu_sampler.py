@@ -0,0 +1,119 @@
+# STDLIB
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+# THIRD PARTY
+import psutil
+
+# CPU times already counted in the user and nice times
+GUEST_TIMES = ("guest", "guest_nice")
+IDLE_TIMES = ("idle", "iowait")
+BREAKDOWN_TIMES = ("iowait", "steal", "irq", "softirq")
+# Length (in seconds) of the blocking sample taken on first use
+FIRST_WINDOW = 0.1
+
+
+def compute_utilization(deltas: Dict[str, float]) -> Dict[str, float]:
+    """
+    Return the busy percentage and the percentages of the breakdown
+    times of the CPU time deltas.
+    """
+    total = sum(
+        delta for name, delta in deltas.items() if name not in GUEST_TIMES
+    )
+    if not total:
+        total = 1.0
+    idle = sum(deltas.get(name, 0.0) for name in IDLE_TIMES)
+    utilization = {"percentage": round(100 * (total - idle) / total, 2)}
+    utilization.update(
+        (name, round(100 * deltas[name] / total, 2))
+        for name in BREAKDOWN_TIMES
+        if name in deltas
+    )
+    return utilization
+
+
+class CPUSampler:
+    """
+    A background sampler of the CPU times, computing the overall and the
+    per-core utilization over consecutive windows of the given length.
+    Readers get the latest computed utilization without blocking, so all
+    of them see the same values, however often they read them. Until the
+    first window has passed, the utilization over a short blocking sample
+    taken on first use is returned.
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self.latest: Optional[dict] = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def compute(previous: Optional[list], current: list) -> dict:
+        """Compute the utilization between two per-core CPU times."""
+        core_deltas = []
+        for index, times in enumerate(current):
+            previous_times = previous[index] if previous else None
+            core_deltas.append({
+                name: max(
+                    value - (getattr(previous_times, name) if previous else 0),
+                    0.0,
+                )
+                for name, value in times._asdict().items()
+            })
+        total_deltas = {
+            name: sum(deltas[name] for deltas in core_deltas)
+            for name in core_deltas[0]
+        }
+        utilization = compute_utilization(total_deltas)
+        utilization["per_core"] = [
+            compute_utilization(deltas)["percentage"]
+            for deltas in core_deltas
+        ]
+        return utilization
+
+    def get(self) -> dict:
+        """Return the latest utilization, starting the sampler if needed."""
+        with self.lock:
+            if self.thread is None:
+                previous = psutil.cpu_times(percpu=True)
+                time.sleep(FIRST_WINDOW)
+                current = psutil.cpu_times(percpu=True)
+                self.latest = self.compute(previous, current)
+                self.thread = threading.Thread(
+                    target=self.run,
+                    args=(current,),
+                    daemon=True,
+                )
+                self.thread.start()
+        return self.latest
+
+    def sample(self, previous: List) -> List:
+        """
+        Compute the utilization since the previous CPU times and return
+        the current ones, or the previous ones if they can't be read.
+        When the number of cores changed, the utilization is computed
+        again from the next window on.
+        """
+        try:
+            current = psutil.cpu_times(percpu=True)
+        except OSError as exc:
+            logging.warning("Couldn't sample CPU times: %s", exc)
+            return previous
+        try:
+            self.latest = self.compute(previous, current)
+        except IndexError as exc:
+            logging.warning("Couldn't compare CPU times: %s", exc)
+        return current
+
+    def run(self, previous: List) -> None:
+        """Compute the utilization of every window."""
+        while True:
+            time.sleep(self.window)
+            previous = self.sample(previous)
+
+
+cpu_sampler = CPUSampler()
@@ -0,0 +1,46 @@
+# STDLIB
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+class DeadbandFilter:
+    """
+    Change-only storage of the readings of the configured metrics. A
+    reading is stored only when it moves by more than the metric's
+    tolerance from the last stored one, or once the maximum silence has
+    passed since then. The last skipped reading is stored before the
+    reading that moved, so that the stored series keeps its step shape.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, dict]] = None):
+        self.settings = settings or {}
+        self.stored: Dict[str, Tuple[datetime, float]] = {}
+        self.skipped: Dict[str, Tuple[datetime, float]] = {}
+
+    def filter(
+        self,
+        records: List[Tuple[str, datetime, float]],
+    ) -> List[Tuple[str, datetime, float]]:
+        """Return the (table name, date, reading) records to store."""
+        stored_records = []
+        for table_name, date, reading in records:
+            settings = self.settings.get(table_name)
+            if not settings:
+                stored_records.append((table_name, date, reading))
+                continue
+            last = self.stored.get(table_name)
+            skipped = self.skipped.pop(table_name, None)
+            if last:
+                moved = abs(reading - last[1]) > settings.get("tolerance", 0)
+                silent = (
+                    (date - last[0]).total_seconds()
+                    < settings.get("max_silence", float("inf"))
+                )
+                if not moved and silent:
+                    self.skipped[table_name] = (date, reading)
+                    continue
+                if moved and skipped:
+                    stored_records.append((table_name, *skipped))
+            stored_records.append((table_name, date, reading))
+            self.stored[table_name] = (date, reading)
+        return stored_records
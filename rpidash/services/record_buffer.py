@@ -0,0 +1,64 @@
+# STDLIB
+import logging
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# THIRD PARTY
+from sqlalchemy.exc import SQLAlchemyError
+
+# FIRST PARTY
+from rpidash.database import db_session
+from rpidash.models.model_manager import ModelManager
+
+
+class RecordBuffer:
+    """
+    An in-memory buffer of readings that are written to the database
+    in a single transaction when flushed.
+    """
+
+    def __init__(self, max_size: int = 1):
+        self.max_size = max_size
+        self.records: List[Tuple[str, datetime, float]] = []
+        self.lock = threading.Lock()
+
+    def add(
+        self,
+        table_name: str,
+        reading: float,
+        date: Optional[datetime] = None,
+    ) -> None:
+        """Add a reading to the buffer, flushing it once it is full."""
+        self.extend([(table_name, date or datetime.now(), reading)])
+
+    def extend(self, records: List[Tuple[str, datetime, float]]) -> None:
+        """
+        Add (table name, date, reading) records to the buffer, flushing
+        it once it is full.
+        """
+        with self.lock:
+            self.records.extend(records)
+            full = len(self.records) >= self.max_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered readings to the database."""
+        with self.lock:
+            records, self.records = self.records, []
+        if not records:
+            return
+        try:
+            ModelManager().store_records(records)
+        except SQLAlchemyError as exc:
+            db_session.rollback()
+            logging.error(
+                "Couldn't store %s buffered records: %s",
+                len(records),
+                exc,
+            )
+            with self.lock:
+                self.records[:0] = records
+        finally:
+            db_session.remove()
@@ -0,0 +1,211 @@
+# STDLIB
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# FIRST PARTY
+from rpidash.models.model_manager import (
+    DATE_FORMAT,
+    MAX_POINTS,
+    ModelManager,
+    to_timestamp,
+)
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer of (timestamp, reading) samples ordered by their
+    timestamps. The samples are kept in preallocated arrays and the
+    oldest one is overwritten once the buffer is full.
+    """
+
+    __slots__ = (
+        "capacity",
+        "timestamps",
+        "values",
+        "head",
+        "size",
+        "covered_after",
+    )
+
+    def __init__(self, capacity: int, covered_after: float = float("-inf")):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.size = 0
+        # All samples newer than this timestamp are in the buffer
+        self.covered_after = covered_after
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Append a sample, overwriting the oldest one when full."""
+        index = (self.head + self.size) % self.capacity
+        if self.size == self.capacity:
+            self.covered_after = self.timestamps[self.head]
+            self.head = (self.head + 1) % self.capacity
+        else:
+            self.size += 1
+        self.timestamps[index] = timestamp
+        self.values[index] = value
+
+    def bisect(self, timestamp: float, right: bool = False) -> int:
+        """
+        Return the position of the first sample newer than the timestamp,
+        or not older than it unless right is set.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            sample = self.timestamps[(self.head + middle) % self.capacity]
+            if sample < timestamp or (right and sample == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_range(
+        self,
+        recorded_after: Optional[datetime] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[int, int]:
+        """
+        Return the positions of the first sample recorded after the first
+        date and not before the start date, and of the first sample after
+        the end date.
+        """
+        first = self.bisect(to_timestamp(start)) if start else 0
+        if recorded_after:
+            first = max(first, self.bisect(to_timestamp(recorded_after), True))
+        last = self.bisect(to_timestamp(end), True) if end else self.size
+        return first, max(first, last)
+
+    def discard_before(self, timestamp: float) -> None:
+        """
+        Drop the samples older than the timestamp. The buffer covers only
+        the samples newer than it from then on.
+        """
+        count = self.bisect(timestamp)
+        self.head = (self.head + count) % self.capacity
+        self.size -= count
+        self.covered_after = max(self.covered_after, timestamp)
+
+    def slice(self, first: int, last: int) -> Tuple[array, array]:
+        """Return the timestamps and values of the samples first to last."""
+        start = (self.head + first) % self.capacity
+        stop = start + last - first
+        if stop <= self.capacity:
+            return self.timestamps[start:stop], self.values[start:stop]
+        stop -= self.capacity
+        return (
+            self.timestamps[start:] + self.timestamps[:stop],
+            self.values[start:] + self.values[:stop],
+        )
+
+
+class RecentReadings:
+    """
+    Ring buffers of the newest raw readings of every metric, shared
+    between the requests of a process. Before every read only the rows
+    stored since the previous one are fetched from the database, so the
+    recent history is answered from memory. Readings older than the
+    retention, which are purged from the database, are dropped from the
+    buffers.
+    """
+
+    def __init__(self, size: int, retention: Optional[int] = None):
+        self.size = size
+        self.retention = retention
+        self.buffers: Dict[str, RingBuffer] = {}
+        self.newest_dates: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def refresh(self, manager: ModelManager) -> RingBuffer:
+        """
+        Append the rows stored since the previous refresh to the metric's
+        buffer. The buffer is loaded again from the newest rows when there
+        are none buffered yet or when the new rows don't fit in it. The
+        database is queried without holding the lock, and the rows a
+        concurrent refresh appended in the meantime are skipped.
+        """
+        table_name = manager.model.__tablename__
+        with self.lock:
+            newest_date = None
+            if table_name in self.buffers:
+                newest_date = self.newest_dates.get(table_name)
+        rows = manager.retrieve_latest_rows(self.size, after=newest_date)
+        with self.lock:
+            buffer = self.buffers.get(table_name)
+            newest_date = self.newest_dates.get(table_name)
+            if buffer is None or len(rows) == self.size:
+                buffer = RingBuffer(self.size)
+                if len(rows) == self.size:
+                    buffer.covered_after = to_timestamp(
+                        datetime.fromisoformat(rows[-1][0]),
+                    )
+                self.buffers[table_name] = buffer
+                newest_date = None
+            for date, value in reversed(rows):
+                if newest_date and date <= newest_date:
+                    continue
+                timestamp = to_timestamp(datetime.fromisoformat(date))
+                buffer.append(timestamp, value)
+                self.newest_dates[table_name] = date
+            if self.retention:
+                buffer.discard_before(to_timestamp(
+                    datetime.now() - timedelta(seconds=self.retention),
+                ))
+        return buffer
+
+    def get(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        table_name: str,
+        *,
+        recorded_after: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        epoch_dates: bool = False,
+        page_size: Optional[str] = None,
+    ) -> Optional[Dict[str, List]]:
+        """
+        Return the raw readings within the date range like
+        ModelManager.retrieve_data, or None when the database has to be
+        queried instead: when the range starts before the buffered
+        readings or when they don't fit in a single page.
+        """
+        manager = ModelManager(table_name)
+        recorded_after_dt, start_dt, end_dt = manager.parse_date_range(
+            recorded_after,
+            start,
+            end,
+        )
+        page_size = manager.parse_count(page_size, "page_size") or MAX_POINTS
+        bounds = [
+            to_timestamp(date)
+            for date in (recorded_after_dt, start_dt)
+            if date
+        ]
+        if not bounds:
+            return None
+        buffer = self.refresh(manager)
+        with self.lock:
+            if max(bounds) <= buffer.covered_after:
+                return None
+            first, last = buffer.find_range(
+                recorded_after_dt,
+                start_dt,
+                end_dt,
+            )
+            if last - first > page_size:
+                return None
+            timestamps, values = buffer.slice(first, last)
+        if epoch_dates:
+            dates = [int(timestamp) for timestamp in timestamps]
+        else:
+            dates = [
+                time.strftime(DATE_FORMAT, time.gmtime(timestamp))
+                for timestamp in timestamps
+            ]
+        return {"values": values.tolist(), "dates": dates, "next_cursor": None}
@@ -0,0 +1,44 @@
+# STDLIB
+import fcntl
+import os
+from typing import Optional
+
+
+class SchedulerLock:
+    """
+    An exclusive file lock that allows only one process on the host to
+    run the scheduled tasks. The lock is released by the operating system
+    when the holding process exits, so another process can take over.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.descriptor = None
+
+    @property
+    def acquired(self) -> bool:
+        """Return whether this process holds the lock."""
+        return self.descriptor is not None or not self.path
+
+    def acquire(self) -> bool:
+        """Try to acquire the lock without blocking."""
+        if self.acquired:
+            return True
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(descriptor)
+            return False
+        os.ftruncate(descriptor, 0)
+        os.write(descriptor, str(os.getpid()).encode())
+        self.descriptor = descriptor
+        return True
+
+    def release(self) -> None:
+        """Release the lock if this process holds it."""
+        if self.descriptor is None:
+            return
+        fcntl.flock(self.descriptor, fcntl.LOCK_UN)
+        os.close(self.descriptor)
+        self.descriptor = None
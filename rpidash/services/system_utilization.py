@@ -1,9 +1,13 @@
 # STDLIB
 import logging
+from typing import Optional
 
 # THIRD PARTY
 import psutil
 
+# FIRST PARTY
+from rpidash.services.cpu_sampler import cpu_sampler
+
 
 class SystemUtilization:
     """A class to represent the system utilization metrics."""
@@ -11,6 +15,8 @@ class SystemUtilization:
     def __init__(self):
         self.cpu_temperature = 0.0
         self.cpu_percentage = 0.0
+        self.cpu_per_core = []
+        self.cpu_breakdown = {}
 
         self.memory_percentage = 0.0
         self.memory_used = 0.0
@@ -33,6 +39,8 @@ class SystemUtilization:
         return {
             "cpu_temperature": self.cpu_temperature,
             "cpu_percentage": self.cpu_percentage,
+            "cpu_per_core": self.cpu_per_core,
+            "cpu_breakdown": self.cpu_breakdown,
             "memory_percentage": self.memory_percentage,
             "memory_used": self.memory_used,
             "memory_total": self.memory_total,
@@ -43,16 +51,27 @@ class SystemUtilization:
 
     def get_cpu_temperature(self) -> "SystemUtilization":
         """Get current average temperature between CPU cores."""
+        cpu_temperature = self.read_cpu_temperature()
+        if cpu_temperature is not None:
+            self.cpu_temperature = cpu_temperature
+        return self
+
+    @classmethod
+    def read_cpu_temperature(cls) -> Optional[float]:
+        """
+        Return the current average temperature between CPU cores, or None
+        when no sensor reports it.
+        """
         try:
             temps = psutil.sensors_temperatures()
-            core_temps = self.extract_core_temps(temps)
-            self.cpu_temperature = round(sum(core_temps) / len(core_temps), 2)
+            core_temps = cls.extract_core_temps(temps)
+            return round(sum(core_temps) / len(core_temps), 2)
         except (AttributeError, ZeroDivisionError) as exc:
             logging.warning(
                 "Couldn't get CPU temperature: %s",
                 exc,
             )
-        return self
+            return None
 
     @staticmethod
     def extract_core_temps(temps: dict) -> list:
@@ -64,8 +83,15 @@ class SystemUtilization:
         return []
 
     def get_cpu_percentage(self) -> "SystemUtilization":
-        """Get current system-wide CPU utilization as a percentage."""
-        self.cpu_percentage = psutil.cpu_percent()
+        """
+        Get the system-wide and per-core CPU utilization as percentages,
+        with the iowait, steal and interrupt shares, over the latest
+        window of the process's CPU sampler.
+        """
+        utilization = dict(cpu_sampler.get())
+        self.cpu_per_core = utilization.pop("per_core")
+        self.cpu_percentage = utilization.pop("percentage")
+        self.cpu_breakdown = utilization
         return self
 
     def get_memory_utilization(self) -> "SystemUtilization":
@@ -1,14 +1,30 @@
 # STDLIB
+import atexit
 import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
 # THIRD PARTY
-from flask_apscheduler import APScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy.engine import make_url
 
 # FIRST PARTY
-from rpidash.models.model_manager import ModelManager
-from rpidash.services.system_utilization import SystemUtilization
+from rpidash import database as db
+from rpidash.metrics import Metric, get_metrics
+from rpidash.models.migrations import migrate_db
+from rpidash.models.model_manager import DELETE_BATCH_SIZE, ModelManager
+from rpidash.services.adaptive_interval import AdaptiveInterval
+from rpidash.services.deadband import DeadbandFilter
+from rpidash.services.record_buffer import RecordBuffer
+from rpidash.services.scheduler_lock import SchedulerLock
 from rpidash.utils.utils import load_app_config
 
+LEGACY_INTERVALS = ("cpu_temperature", "cpu_percentage", "memory_percentage")
+LOCK_FILE_NAME = "scheduler.lock"
+
 
 class TaskScheduler:
     """A service for scheduling and executing system utilization tasks."""
@@ -16,66 +32,266 @@ class TaskScheduler:
     def __init__(self):
         logging.getLogger("apscheduler").setLevel(logging.WARNING)
 
-        self.scheduler = APScheduler()
-        self.config = load_app_config()
-        self.intervals = self.config["scheduled_tasks"]["intervals"]
-        self.delete_config = self.config["scheduled_tasks"]["deletion"]
-        self.utilization = SystemUtilization()
+        self.scheduler = BackgroundScheduler()
+        self.config = {}
+        self.intervals = {}
+        self.delete_config = {}
+        self.buffer_config = {}
+        self.adaptive = None
+        self.collection_interval = None
+        self.deadband = DeadbandFilter()
+        self.apply_config(load_app_config())
+        self.lock_config = self.config["scheduled_tasks"].get("lock", {})
+        self.buffer = RecordBuffer(
+            max_size=self.buffer_config.get("max_size", 1),
+        )
+        self.lock = SchedulerLock(self.get_lock_path())
+        self.standby = None
 
         self._setup_tasks()
 
+    def get_lock_path(self) -> str:
+        """
+        Return the path of the scheduler lock file. Unless configured, it
+        is kept next to the SQLite database file, which all processes
+        recording into the database share, or in the temporary directory
+        for other databases.
+        """
+        if self.lock_config.get("path"):
+            return self.lock_config["path"]
+        uri = self.config.get("database", {}).get("uri")
+        url = make_url(uri) if uri else None
+        if (
+            url
+            and url.get_backend_name() == "sqlite"
+            and url.database
+            and url.database != ":memory:"
+        ):
+            return os.path.join(
+                os.path.dirname(os.path.abspath(url.database)),
+                LOCK_FILE_NAME,
+            )
+        return os.path.join(tempfile.gettempdir(), f"rpidash-{LOCK_FILE_NAME}")
+
+    def apply_config(self, config: dict) -> None:
+        """Use the settings of the configuration for the next job runs."""
+        self.config = config
+        self.intervals = config["scheduled_tasks"]["intervals"]
+        self.delete_config = config["scheduled_tasks"]["deletion"]
+        self.buffer_config = config["scheduled_tasks"].get("buffer", {})
+        self.collection_interval = self.get_collection_interval()
+        self.deadband.settings = (
+            config["scheduled_tasks"].get("deadband") or {}
+        )
+        adaptive_config = config["scheduled_tasks"].get("adaptive", {})
+        self.adaptive = None
+        if adaptive_config.get("enabled"):
+            # Shorter intervals would read the same CPU sampler window again
+            window = config.get("cpu_sampler", {}).get("window", 1)
+            min_interval = adaptive_config["min_interval"]
+            if min_interval < window:
+                logging.warning(
+                    "The minimum collection interval is shorter than the "
+                    "CPU sampler window, using %s seconds",
+                    window,
+                )
+                min_interval = window
+            self.adaptive = AdaptiveInterval(
+                interval=self.collection_interval,
+                min_interval=min_interval,
+                max_interval=adaptive_config["max_interval"],
+                settings=adaptive_config.get("metrics"),
+            )
+
+    def get_jobs(self) -> Dict[str, Tuple[Callable, Optional[int]]]:
+        """
+        Return the functions and the configured intervals of the jobs by
+        their ids, without an interval when the job is disabled.
+        """
+        return {
+            "collect_metrics": (
+                self.collect_metrics,
+                self.get_collection_interval(),
+            ),
+            "flush_records": (
+                self.buffer.flush,
+                self.buffer_config.get("flush_interval") or None,
+            ),
+            "delete_old_records": (
+                self.delete_old_records,
+                self.intervals["deletion"]
+                if self.delete_config["enabled"] else None,
+            ),
+            "reload_config": (
+                self.reload_config,
+                self.config["scheduled_tasks"].get("reload_interval") or None,
+            ),
+        }
+
     def _setup_tasks(self) -> None:
         """Set up the scheduled tasks with their respective intervals."""
-        self.scheduler.add_job(
-            id="record_cpu_temperature",
-            func=self.record_cpu_temperature,
-            trigger="interval",
-            seconds=self.intervals["cpu_temperature"],
-        )
-        self.scheduler.add_job(
-            id="record_cpu_percentage",
-            func=self.record_cpu_percentage,
-            trigger="interval",
-            seconds=self.intervals["cpu_percentage"],
-        )
-        self.scheduler.add_job(
-            id="record_memory_utilization",
-            func=self.record_memory_utilization,
-            trigger="interval",
-            seconds=self.intervals["memory_percentage"],
+        for job_id, (func, seconds) in self.get_jobs().items():
+            if seconds is not None:
+                self.scheduler.add_job(
+                    id=job_id,
+                    func=func,
+                    trigger="interval",
+                    seconds=seconds,
+                )
+        for metric in get_metrics().values():
+            if metric.interval:
+                self.scheduler.add_job(
+                    id=f"collect_{metric.name}",
+                    func=self.collect_metrics,
+                    args=[[metric]],
+                    trigger="interval",
+                    seconds=metric.interval,
+                )
+
+    def reload_config(self) -> None:
+        """
+        Apply the changes of the configuration file to the running jobs:
+        reschedule the jobs whose interval changed, add the enabled and
+        remove the disabled ones. The retention and buffer settings are
+        used from the next run of their jobs.
+        """
+        config = load_app_config()
+        if config is self.config:
+            return
+        previous_jobs = self.get_jobs()
+        # The collection may run at an adapted interval
+        previous_jobs["collect_metrics"] = (
+            self.collect_metrics,
+            self.collection_interval,
         )
-        if self.delete_config["enabled"]:
-            self.scheduler.add_job(
-                id="delete_old_records",
-                func=self.delete_old_records,
-                trigger="interval",
-                seconds=self.intervals["deletion"],
-            )
+        self.apply_config(config)
+        self.buffer.max_size = self.buffer_config.get("max_size", 1)
+        for job_id, (func, seconds) in self.get_jobs().items():
+            previous_seconds = previous_jobs[job_id][1]
+            if seconds == previous_seconds:
+                continue
+            logging.info("Rescheduling %s every %s seconds", job_id, seconds)
+            if seconds is None:
+                self.scheduler.remove_job(job_id)
+            elif previous_seconds is None:
+                self.scheduler.add_job(
+                    id=job_id,
+                    func=func,
+                    trigger="interval",
+                    seconds=seconds,
+                )
+            else:
+                self.scheduler.reschedule_job(
+                    job_id,
+                    trigger="interval",
+                    seconds=seconds,
+                )
 
     def start(self) -> None:
-        """Start the scheduler to begin executing tasks."""
+        """
+        Start the scheduler to begin executing tasks once this process
+        holds the scheduler lock, otherwise retry periodically to take
+        over from the process holding it. The database is brought up to
+        date first, so that only one process runs the migrations.
+        """
+        if not self.lock.acquire():
+            logging.info(
+                "Scheduled tasks run in another process, process %s is"
+                " on standby",
+                os.getpid(),
+            )
+            self.standby = threading.Timer(
+                self.lock_config.get("retry_interval", 30),
+                self.start,
+            )
+            self.standby.daemon = True
+            self.standby.start()
+            return
+        logging.info("Starting scheduled tasks in process %s", os.getpid())
+        self.standby = None
+        migrate_db(db.engine)
         self.scheduler.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self) -> None:
+        """
+        Stop the scheduler, write the buffered readings and release the
+        scheduler lock.
+        """
+        if self.standby:
+            self.standby.cancel()
+            return
+        if not self.scheduler.running:
+            return
+        self.scheduler.shutdown()
+        self.buffer.flush()
+        self.lock.release()
 
-    def record_cpu_temperature(self) -> None:
-        """Get CPU temperature and store it in the database."""
-        reading = self.utilization.get_cpu_temperature().cpu_temperature
-        if reading:
-            ModelManager("cpu_temperature").store_record(reading=reading)
+    def get_collection_interval(self) -> int:
+        """
+        Return the metric collection interval, falling back to the
+        shortest per-metric interval of older configuration files.
+        """
+        if "collection" in self.intervals:
+            return self.intervals["collection"]
+        return min(
+            self.intervals[key] for key in LEGACY_INTERVALS
+            if key in self.intervals
+        )
 
-    def record_cpu_percentage(self) -> None:
-        """Get CPU utilization percentage and store it in the database."""
-        reading = self.utilization.get_cpu_percentage().cpu_percentage
-        if reading:
-            ModelManager("cpu_utilization").store_record(reading=reading)
+    def collect_metrics(self, metrics: Optional[List[Metric]] = None) -> None:
+        """
+        Sample the metrics in one pass and buffer the readings passing the
+        dead-band for storage with a shared date. By default, all metrics
+        without an interval of their own are sampled, and the collection
+        job is rescheduled when the adaptive interval changes.
+        """
+        collection_pass = metrics is None
+        if collection_pass:
+            metrics = [
+                metric for metric in get_metrics().values()
+                if not metric.interval
+            ]
+        date = datetime.now()
+        readings = [(metric.name, metric.sample()) for metric in metrics]
+        self.buffer.extend(self.deadband.filter([
+            (table_name, date, reading)
+            for table_name, reading in readings
+            if reading is not None
+        ]))
+        if collection_pass and self.adaptive:
+            self.adapt_collection_interval({
+                name: reading
+                for name, reading in readings
+                if reading is not None
+            })
 
-    def record_memory_utilization(self) -> None:
-        """Get memory utilization percentage and store it in the database."""
-        reading = self.utilization.get_memory_utilization().memory_percentage
-        if reading:
-            ModelManager("memory_utilization").store_record(reading=reading)
+    def adapt_collection_interval(self, readings: Dict[str, float]) -> None:
+        """Reschedule the collection job at the adapted interval."""
+        interval = self.adaptive.update(readings)
+        if interval == self.collection_interval:
+            return
+        logging.debug("Collecting metrics every %s seconds", interval)
+        self.collection_interval = interval
+        self.scheduler.reschedule_job(
+            "collect_metrics",
+            trigger="interval",
+            seconds=interval,
+        )
 
     def delete_old_records(self) -> None:
-        """Delete records older than the configured date."""
+        """
+        Delete raw records and rollup rows older than the retention
+        configured for their resolution in small batches, and return the
+        freed space to the file system.
+        """
         ModelManager().delete_records(
             older_than=self.delete_config["delete_older_than"],
+            rollup_retention=self.delete_config.get("rollups"),
+            batch_size=self.delete_config.get(
+                "batch_size",
+                DELETE_BATCH_SIZE,
+            ),
+            pause=self.delete_config.get("batch_pause", 0),
         )
+        db.incremental_vacuum(self.delete_config.get("vacuum_pages", 0))
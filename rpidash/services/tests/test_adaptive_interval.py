@@ -0,0 +1,66 @@
+# STDLIB
+import unittest
+
+# FIRST PARTY
+from rpidash.services.adaptive_interval import AdaptiveInterval
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    """A test suite for the adaptive sampling interval."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.interval = AdaptiveInterval(
+            interval=10,
+            min_interval=0.5,
+            max_interval=30,
+            settings={
+                "cpu": {"threshold": 5, "deadband": 1},
+                "memory": {"threshold": 5, "deadband": 1},
+                "load": {"threshold": 0.5, "deadband": 0.05},
+            },
+        )
+
+    def test_update_stable(self):
+        """Test the interval backs off while the readings are stable."""
+        self.assertEqual(self.interval.update({"cpu": 10.0}), 10)
+        self.assertEqual(self.interval.update({"cpu": 10.5}), 20)
+        self.assertEqual(self.interval.update({"cpu": 10.0}), 30)
+        self.assertEqual(self.interval.update({"cpu": 12.0}), 30)
+
+    def test_update_volatile(self):
+        """Test the interval drops to the minimum on a large change."""
+        self.interval.update({"cpu": 10.0, "memory": 40.0})
+        self.assertEqual(
+            self.interval.update({"cpu": 10.0, "memory": 60.0}),
+            0.5,
+        )
+        self.assertEqual(
+            self.interval.update({"cpu": 10.0, "memory": 60.0}),
+            1,
+        )
+
+    def test_update_per_metric(self):
+        """Test the change of every metric is checked in its own unit."""
+        self.interval.update({"cpu": 10.0, "load": 0.2})
+        self.assertEqual(
+            self.interval.update({"cpu": 10.0, "load": 1.2}),
+            0.5,
+        )
+        self.assertEqual(
+            self.interval.update({"cpu": 10.5, "load": 1.22}),
+            1,
+        )
+        self.assertEqual(
+            self.interval.update({"cpu": 10.5, "load": 1.5}),
+            1,
+        )
+
+    def test_update_unlisted(self):
+        """Test metrics without settings don't affect the interval."""
+        self.interval.update({"disk": 10.0})
+        self.assertEqual(self.interval.update({"disk": 90.0}), 10)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
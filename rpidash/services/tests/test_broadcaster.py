@@ -0,0 +1,97 @@
+# STDLIB
+import queue
+import unittest
+from unittest.mock import MagicMock, patch
+
+# FIRST PARTY
+from rpidash.services.broadcaster import Broadcaster
+
+
+class TestBroadcaster(unittest.TestCase):
+    """A test suite for the stream broadcaster."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.snapshot = MagicMock()
+        self.snapshot.get.return_value = {"cpu_percentage": 5.0}
+        self.broadcaster = Broadcaster(self.snapshot, interval=10)
+
+    @patch("rpidash.services.broadcaster.threading.Thread")
+    def test_subscribe_starts_single_thread(self, mock_thread):
+        """Test polling starts once for any number of subscribers."""
+        self.broadcaster.subscribe()
+        self.broadcaster.subscribe()
+
+        mock_thread.assert_called_once_with(
+            target=self.broadcaster.run,
+            daemon=True,
+        )
+        mock_thread.return_value.start.assert_called_once()
+        self.assertEqual(len(self.broadcaster.subscribers), 2)
+
+    @patch("rpidash.services.broadcaster.threading.Thread")
+    def test_unsubscribe(self, mock_thread):  # pylint: disable=unused-argument
+        """Test unsubscribed clients no longer receive messages."""
+        subscriber = self.broadcaster.subscribe()
+        self.broadcaster.unsubscribe(subscriber)
+        self.broadcaster.publish({"data": "example"})
+
+        self.assertTrue(subscriber.empty())
+        self.assertEqual(self.broadcaster.subscribers, [])
+
+    @patch("rpidash.services.broadcaster.threading.Thread")
+    def test_publish_skips_full_queues(self, mock_thread):  # pylint: disable=unused-argument
+        """Test a slow subscriber doesn't block the others."""
+        self.broadcaster.max_queue_size = 1
+        slow_subscriber = self.broadcaster.subscribe()
+        slow_subscriber.put_nowait({"data": "old"})
+        self.broadcaster.max_queue_size = 10
+        subscriber = self.broadcaster.subscribe()
+
+        self.broadcaster.publish({"data": "new"})
+
+        self.assertEqual(slow_subscriber.get_nowait(), {"data": "old"})
+        self.assertEqual(subscriber.get_nowait(), {"data": "new"})
+        with self.assertRaises(queue.Empty):
+            slow_subscriber.get_nowait()
+
+    @patch("rpidash.services.broadcaster.ModelManager")
+    def test_collect(self, mock_model_manager):
+        """Test collect returns readings newer than the previous poll."""
+        mock_model_manager.return_value.retrieve_data.side_effect = [
+            {"values": [49.0], "dates": ["2024-01-01T12:00:10"]},
+            {"values": [], "dates": []},
+        ]
+        self.broadcaster.latest_dates = {
+            "cpu_temperature": "2024-01-01T12:00:00",
+            "cpu_utilization": "2024-01-01T12:00:00",
+        }
+
+        message = self.broadcaster.collect()
+
+        self.assertEqual(message["utilization"], {"cpu_percentage": 5.0})
+        self.assertEqual(
+            message["readings"]["cpu_temperature"]["values"],
+            [49.0],
+        )
+        self.assertEqual(
+            self.broadcaster.latest_dates,
+            {
+                "cpu_temperature": "2024-01-01T12:00:10",
+                "cpu_utilization": "2024-01-01T12:00:00",
+            },
+        )
+
+    @patch("rpidash.services.broadcaster.db_session")
+    @patch("rpidash.services.broadcaster.time.sleep")
+    def test_run_stops_without_subscribers(self, mock_sleep, mock_db_session):  # pylint: disable=unused-argument
+        """Test the polling thread exits once nobody is subscribed."""
+        self.broadcaster.thread = MagicMock()
+        self.broadcaster.run()
+
+        self.assertIsNone(self.broadcaster.thread)
+        self.snapshot.get.assert_not_called()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,61 @@
+# STDLIB
+import unittest
+from collections import namedtuple
+from unittest.mock import patch
+
+# FIRST PARTY
+from rpidash.services.cpu_sampler import FIRST_WINDOW, CPUSampler
+
+CPUTimes = namedtuple("CPUTimes", ["user", "idle", "iowait", "guest"])
+
+
+class TestCPUSampler(unittest.TestCase):
+    """A test suite for the background CPU sampler."""
+
+    def test_compute(self):
+        """Test the utilization is computed from the CPU time deltas."""
+        previous = [CPUTimes(10, 10, 0, 0), CPUTimes(10, 10, 0, 0)]
+        current = [CPUTimes(16, 12, 2, 6), CPUTimes(10, 20, 0, 0)]
+        self.assertEqual(
+            CPUSampler.compute(previous, current),
+            {"percentage": 30.0, "iowait": 10.0, "per_core": [60.0, 0.0]},
+        )
+
+    @patch("rpidash.services.cpu_sampler.threading.Thread")
+    @patch("rpidash.services.cpu_sampler.time.sleep")
+    @patch(
+        "rpidash.services.cpu_sampler.psutil.cpu_times",
+        side_effect=[[CPUTimes(300, 100, 0, 0)], [CPUTimes(301, 103, 0, 0)]],
+    )
+    def test_get(self, mock_cpu_times, mock_sleep, mock_thread):  # pylint: disable=unused-argument
+        """Test a short sample is returned before the first window."""
+        sampler = CPUSampler()
+        self.assertEqual(sampler.get()["percentage"], 25.0)
+        sampler.get()
+        mock_sleep.assert_called_once_with(FIRST_WINDOW)
+        mock_thread.return_value.start.assert_called_once()
+        mock_thread.assert_called_once_with(
+            target=sampler.run,
+            args=([CPUTimes(301, 103, 0, 0)],),
+            daemon=True,
+        )
+
+    @patch("rpidash.services.cpu_sampler.psutil.cpu_times")
+    def test_sample_cores_changed(self, mock_cpu_times):
+        """Test the CPU times are replaced when the cores changed."""
+        sampler = CPUSampler()
+        current = [CPUTimes(10, 10, 0, 0), CPUTimes(10, 10, 0, 0)]
+        mock_cpu_times.return_value = current
+        self.assertEqual(sampler.sample([CPUTimes(5, 5, 0, 0)]), current)
+        self.assertIsNone(sampler.latest)
+
+        mock_cpu_times.return_value = [
+            CPUTimes(15, 15, 0, 0),
+            CPUTimes(10, 20, 0, 0),
+        ]
+        sampler.sample(current)
+        self.assertEqual(sampler.latest["per_core"], [50.0, 0.0])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,56 @@
+# STDLIB
+import unittest
+from datetime import datetime
+
+# FIRST PARTY
+from rpidash.services.deadband import DeadbandFilter
+
+
+class TestDeadbandFilter(unittest.TestCase):
+    """A test suite for the change-only storage of readings."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.deadband = DeadbandFilter({
+            "memory_utilization": {"tolerance": 0.5, "max_silence": 30},
+        })
+
+    def store(self, second: int, reading: float, table_name=None) -> list:
+        """Filter a reading recorded at the given second."""
+        return self.deadband.filter([(
+            table_name or "memory_utilization",
+            datetime(2024, 1, 1, 12, 0, second),
+            reading,
+        )])
+
+    def test_filter_steady(self):
+        """Test readings within the tolerance are skipped."""
+        self.assertEqual(len(self.store(0, 40.0)), 1)
+        self.assertEqual(self.store(10, 40.5), [])
+        self.assertEqual(self.store(20, 40.2), [])
+
+    def test_filter_step(self):
+        """Test the last skipped reading is stored before a change."""
+        self.store(0, 40.0)
+        self.store(10, 40.1)
+        self.store(20, 40.2)
+        self.assertEqual(
+            [reading for _, _, reading in self.store(30, 45.0)],
+            [40.2, 45.0],
+        )
+        self.assertEqual(self.store(40, 45.0), [])
+
+    def test_filter_max_silence(self):
+        """Test a reading is stored once the maximum silence passed."""
+        self.store(0, 40.0)
+        self.assertEqual(self.store(29, 40.0), [])
+        self.assertEqual(len(self.store(30, 40.0)), 1)
+
+    def test_filter_unconfigured(self):
+        """Test every reading of other metrics is stored."""
+        self.store(0, 40.0, "cpu_utilization")
+        self.assertEqual(len(self.store(10, 40.0, "cpu_utilization")), 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,80 @@
+# STDLIB
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+# THIRD PARTY
+from sqlalchemy.exc import OperationalError
+
+# FIRST PARTY
+from rpidash.services.record_buffer import RecordBuffer
+
+
+class TestRecordBuffer(unittest.TestCase):
+    """A test suite for the record buffer."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.date = datetime(2024, 1, 1, 12, 0, 0)
+
+    @patch("rpidash.services.record_buffer.ModelManager")
+    def test_add_below_max_size(self, mock_model_manager):
+        """Test readings are kept in memory until the buffer is full."""
+        record_buffer = RecordBuffer(max_size=3)
+        record_buffer.add("cpu_temperature", 49.0, self.date)
+        record_buffer.add("cpu_utilization", 50.0, self.date)
+
+        mock_model_manager.return_value.store_records.assert_not_called()
+        self.assertEqual(
+            record_buffer.records,
+            [
+                ("cpu_temperature", self.date, 49.0),
+                ("cpu_utilization", self.date, 50.0),
+            ],
+        )
+
+    @patch("rpidash.services.record_buffer.ModelManager")
+    def test_add_flushes_when_full(self, mock_model_manager):
+        """Test all buffered readings are stored once the buffer is full."""
+        record_buffer = RecordBuffer(max_size=2)
+        record_buffer.add("cpu_temperature", 49.0, self.date)
+        record_buffer.add("cpu_utilization", 50.0, self.date)
+
+        mock_model_manager.return_value.store_records.assert_called_once_with(
+            [
+                ("cpu_temperature", self.date, 49.0),
+                ("cpu_utilization", self.date, 50.0),
+            ],
+        )
+        self.assertEqual(record_buffer.records, [])
+
+    @patch("rpidash.services.record_buffer.ModelManager")
+    def test_flush_empty(self, mock_model_manager):
+        """Test flushing an empty buffer doesn't touch the database."""
+        RecordBuffer().flush()
+        mock_model_manager.return_value.store_records.assert_not_called()
+
+    @patch("rpidash.services.record_buffer.db_session")
+    @patch("rpidash.services.record_buffer.ModelManager")
+    def test_flush_error_keeps_records(
+        self,
+        mock_model_manager,
+        mock_db_session,
+    ):
+        """Test readings are kept in the buffer when storing fails."""
+        mock_model_manager.return_value.store_records.side_effect = (
+            OperationalError("INSERT", {}, Exception("database is locked"))
+        )
+        record_buffer = RecordBuffer(max_size=10)
+        record_buffer.add("cpu_temperature", 49.0, self.date)
+        record_buffer.flush()
+
+        mock_db_session.rollback.assert_called_once()
+        self.assertEqual(
+            record_buffer.records,
+            [("cpu_temperature", self.date, 49.0)],
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
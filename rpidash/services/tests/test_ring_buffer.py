@@ -0,0 +1,157 @@
+# STDLIB
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# FIRST PARTY
+from rpidash import create_app
+from rpidash.database import db_session
+from rpidash.models.model_manager import ModelManager
+from rpidash.models.models import CPUTemperature
+from rpidash.services.ring_buffer import RecentReadings, RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    """A test suite for the RingBuffer class."""
+
+    def setUp(self):
+        """Fill a buffer past its capacity."""
+        self.buffer = RingBuffer(3)
+        for timestamp in range(1, 6):
+            self.buffer.append(float(timestamp), timestamp * 10.0)
+
+    def test_append(self):
+        """Test the oldest samples are overwritten."""
+        timestamps, values = self.buffer.slice(0, self.buffer.size)
+        self.assertEqual(timestamps.tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(values.tolist(), [30.0, 40.0, 50.0])
+        self.assertEqual(self.buffer.covered_after, 2.0)
+
+    def test_bisect(self):
+        """Test the positions of timestamps among the samples."""
+        self.assertEqual(self.buffer.bisect(4.0), 1)
+        self.assertEqual(self.buffer.bisect(4.0, right=True), 2)
+        self.assertEqual(self.buffer.bisect(0.0), 0)
+        self.assertEqual(self.buffer.bisect(9.0), 3)
+
+    def test_discard_before(self):
+        """Test older samples are dropped and no longer covered."""
+        self.buffer.discard_before(4.5)
+        timestamps, values = self.buffer.slice(0, self.buffer.size)
+        self.assertEqual(timestamps.tolist(), [5.0])
+        self.assertEqual(values.tolist(), [50.0])
+        self.assertEqual(self.buffer.covered_after, 4.5)
+        self.buffer.append(6.0, 60.0)
+        self.assertEqual(self.buffer.slice(0, 2)[0].tolist(), [5.0, 6.0])
+
+
+class TestRecentReadings(unittest.TestCase):
+    """A test suite for the RecentReadings class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test environment."""
+        cls.app = create_app()
+        cls.context = cls.app.app_context()
+        cls.context.push()
+
+    def setUp(self):
+        """Store three readings into the database."""
+        self.manager = ModelManager("cpu_temperature")
+        CPUTemperature.query.delete()
+        db_session.commit()
+        self.store(datetime(2024, 1, 1, 12, 0, 0), 40.0)
+        self.store(datetime(2024, 1, 1, 12, 0, 10, 500000), 50.0)
+        self.store(datetime(2024, 1, 1, 12, 0, 20), 60.0)
+        self.recent = RecentReadings(3)
+
+    def tearDown(self):
+        """Remove the stored readings."""
+        CPUTemperature.query.delete()
+        db_session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the test environment."""
+        cls.context.pop()
+
+    def store(self, date: datetime, value: float) -> None:
+        """Store a reading of the given date."""
+        self.manager.store_records([("cpu_temperature", date, value)])
+
+    def test_get_matches_database(self):
+        """Test buffered readings are returned like the database ones."""
+        for kwargs in (
+            {"recorded_after": "2024-01-01T12:00:09"},
+            {"start": "2024-01-01T12:00:10", "end": "2024-01-01T12:00:15"},
+            {"start": "2024-01-01T12:00:10", "epoch_dates": True},
+        ):
+            self.assertEqual(
+                self.recent.get("cpu_temperature", **kwargs),
+                self.manager.retrieve_data(**kwargs),
+            )
+
+    def test_get_refreshes(self):
+        """Test readings stored after the previous read are returned."""
+        self.recent.get("cpu_temperature", start="2024-01-01T12:00:10")
+        self.store(datetime(2024, 1, 1, 12, 0, 30), 70.0)
+
+        data = self.recent.get(
+            "cpu_temperature",
+            recorded_after="2024-01-01T12:00:18",
+        )
+        self.assertEqual(data["values"], [60.0, 70.0])
+        self.assertIsNone(self.recent.get(
+            "cpu_temperature",
+            start="2024-01-01T12:00:00",
+        ))
+
+    def test_get_skips_concurrent_rows(self):
+        """Test rows appended by a concurrent refresh are skipped."""
+        self.recent.get("cpu_temperature", start="2024-01-01T12:00:10")
+        self.store(datetime(2024, 1, 1, 12, 0, 30), 70.0)
+        rows = self.manager.retrieve_latest_rows(
+            3,
+            after=self.recent.newest_dates["cpu_temperature"],
+        )
+        self.recent.get("cpu_temperature", start="2024-01-01T12:00:10")
+        with patch.object(
+            ModelManager,
+            "retrieve_latest_rows",
+            return_value=rows,
+        ):
+            data = self.recent.get(
+                "cpu_temperature",
+                start="2024-01-01T12:00:10",
+            )
+        self.assertEqual(data["values"], [50.0, 60.0, 70.0])
+
+    def test_get_retention(self):
+        """Test readings older than the retention are not answered."""
+        self.recent.retention = 60
+        now = datetime.now()
+        self.store(now - timedelta(seconds=90), 70.0)
+        self.store(now - timedelta(seconds=30), 80.0)
+
+        data = self.recent.get(
+            "cpu_temperature",
+            start=(now - timedelta(seconds=45)).isoformat("T", "seconds"),
+        )
+        self.assertEqual(data["values"], [80.0])
+        self.assertIsNone(self.recent.get(
+            "cpu_temperature",
+            start=(now - timedelta(seconds=120)).isoformat("T", "seconds"),
+        ))
+
+    def test_get_not_buffered(self):
+        """Test ranges starting before the buffer are not answered."""
+        for kwargs in (
+            {},
+            {"start": "2024-01-01T12:00:00"},
+            {"recorded_after": "2024-01-01T12:00:09", "page_size": "1"},
+        ):
+            self.assertIsNone(self.recent.get("cpu_temperature", **kwargs))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
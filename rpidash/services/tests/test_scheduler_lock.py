@@ -0,0 +1,50 @@
+# STDLIB
+import os
+import tempfile
+import unittest
+
+# FIRST PARTY
+from rpidash.services.scheduler_lock import SchedulerLock
+
+
+class TestSchedulerLock(unittest.TestCase):
+    """A test suite for the scheduler lock."""
+
+    def setUp(self):
+        """Set up a temporary lock file path."""
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "scheduler.lock")
+
+    def tearDown(self):
+        """Remove the temporary lock file."""
+        self.directory.cleanup()
+
+    def test_acquire_without_path(self):
+        """Test the lock is always acquired when no path is configured."""
+        self.assertTrue(SchedulerLock().acquire())
+
+    def test_acquire_exclusive(self):
+        """Test only one holder can acquire the lock at a time."""
+        lock = SchedulerLock(self.path)
+        other_lock = SchedulerLock(self.path)
+
+        self.assertTrue(lock.acquire())
+        self.assertFalse(other_lock.acquire())
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), str(os.getpid()))
+
+        lock.release()
+        self.assertTrue(other_lock.acquire())
+        other_lock.release()
+
+    def test_acquire_repeated(self):
+        """Test acquiring a held lock again succeeds."""
+        lock = SchedulerLock(self.path)
+        self.assertTrue(lock.acquire())
+        self.assertTrue(lock.acquire())
+        lock.release()
+        self.assertFalse(lock.acquired)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
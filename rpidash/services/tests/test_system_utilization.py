@@ -41,11 +41,22 @@ class TestSystemUtilization(unittest.TestCase):
         system_util = SystemUtilization().get_cpu_temperature()
         self.assertEqual(system_util.cpu_temperature, 0.0)
 
-    @patch("psutil.cpu_percent", return_value=50)
-    def test_get_cpu_percentage_valid_utilization(self, mock_cpu_percent):  # pylint: disable=unused-argument
+    @patch("rpidash.services.system_utilization.psutil")
+    def test_read_cpu_temperature_unavailable(self, mock_psutil):
+        """Test read_cpu_temperature with missing sensor data."""
+        mock_psutil.sensors_temperatures.return_value = {}
+        self.assertIsNone(SystemUtilization.read_cpu_temperature())
+
+    @patch(
+        "rpidash.services.system_utilization.cpu_sampler.get",
+        return_value={"percentage": 50.0, "iowait": 5.0, "per_core": [50.0]},
+    )
+    def test_get_cpu_percentage_valid_utilization(self, mock_get):  # pylint: disable=unused-argument
         """Test get_cpu_percentage with valid CPU utilization."""
         system_util = SystemUtilization().get_cpu_percentage()
         self.assertEqual(system_util.cpu_percentage, 50.0)
+        self.assertEqual(system_util.cpu_per_core, [50.0])
+        self.assertEqual(system_util.cpu_breakdown, {"iowait": 5.0})
 
     @patch(
         "psutil.virtual_memory",
@@ -109,6 +120,8 @@ class TestSystemUtilization(unittest.TestCase):
         expected_dict = {
             "cpu_temperature": 0.0,
             "cpu_percentage": 0.0,
+            "cpu_per_core": [],
+            "cpu_breakdown": {},
             "memory_percentage": 0.0,
             "memory_used": 0.0,
             "memory_total": 0.0,
@@ -1,8 +1,22 @@
 # STDLIB
+import os
+import tempfile
 import unittest
-from unittest.mock import patch
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+# THIRD PARTY
+from sqlalchemy import text
 
 # FIRST PARTY
+from rpidash import create_app
+from rpidash import database as db
+from rpidash.database import db_session
+from rpidash.metrics import Metric
+from rpidash.models.migrations import migrate_auto_vacuum
+from rpidash.models.model_manager import DELETE_BATCH_SIZE, ModelManager
+from rpidash.models.models import CPUTemperature
+from rpidash.services.adaptive_interval import AdaptiveInterval
 from rpidash.services.task_scheduler import TaskScheduler
 
 
@@ -10,20 +24,23 @@ class TestTaskScheduler(unittest.TestCase):
     """A test suite for the task scheduler."""
 
     @patch("rpidash.services.task_scheduler.load_app_config")
-    @patch("rpidash.services.task_scheduler.APScheduler")
+    @patch("rpidash.services.task_scheduler.BackgroundScheduler")
     def setUp(self, mock_scheduler, mock_load_config):  # pylint: disable=arguments-differ
         """Set up common attributes for tests."""
         self.mock_config = {
             "scheduled_tasks": {
                 "intervals": {
-                    "cpu_temperature": 10,
-                    "cpu_percentage": 20,
-                    "memory_percentage": 30,
+                    "collection": 10,
                     "deletion": 40,
                 },
+                "buffer": {
+                    "flush_interval": 50,
+                    "max_size": 100,
+                },
                 "deletion": {
                     "enabled": True,
                     "delete_older_than": 7,
+                    "rollups": {"1m": 8, "15m": 9, "1h": 10},
                 }
             }
         }
@@ -33,63 +50,337 @@ class TestTaskScheduler(unittest.TestCase):
 
     @patch(
         "rpidash.services.system_utilization"
-        ".SystemUtilization.get_cpu_temperature"
+        ".SystemUtilization.get_memory_utilization"
     )
-    @patch("rpidash.services.task_scheduler.ModelManager.store_record")
-    def test_record_cpu_temperature(
-        self,
-        mock_store_record,
-        mock_get_cpu_temperature,
-    ):
-        """Test record_cpu_temperature method."""
-        mock_get_cpu_temperature.return_value.cpu_temperature = 49.0
-        self.task_scheduler.record_cpu_temperature()
-        mock_store_record.assert_called_with(reading=49.0)
-
     @patch(
         "rpidash.services.system_utilization"
         ".SystemUtilization.get_cpu_percentage"
     )
-    @patch("rpidash.services.task_scheduler.ModelManager.store_record")
-    def test_record_cpu_percentage(
+    @patch(
+        "rpidash.services.system_utilization"
+        ".SystemUtilization.read_cpu_temperature"
+    )
+    @patch("rpidash.metrics.psutil.getloadavg", return_value=(0.5, 0, 0))
+    @patch("rpidash.services.task_scheduler.RecordBuffer.extend")
+    def test_collect_metrics(  # pylint: disable=too-many-arguments
         self,
-        mock_store_record,
+        mock_extend,
+        mock_getloadavg,  # pylint: disable=unused-argument
+        mock_read_cpu_temperature,
         mock_get_cpu_percentage,
+        mock_get_memory_utilization,
     ):
-        """Test record_cpu_percentage method."""
+        """Test collect_metrics buffers all readings with a shared date."""
+        mock_read_cpu_temperature.return_value = 49.0
         mock_get_cpu_percentage.return_value.cpu_percentage = 50.0
-        self.task_scheduler.record_cpu_percentage()
-        mock_store_record.assert_called_with(reading=50.0)
+        mock_get_memory_utilization.return_value.memory_percentage = 51.0
+        self.task_scheduler.collect_metrics()
+
+        (records,), _ = mock_extend.call_args
+        self.assertEqual(
+            [(table_name, reading) for table_name, _, reading in records],
+            [
+                ("cpu_temperature", 49.0),
+                ("cpu_utilization", 50.0),
+                ("memory_utilization", 51.0),
+                ("load_average", 0.5),
+            ],
+        )
+        self.assertEqual(len({date for _, date, _ in records}), 1)
 
     @patch(
         "rpidash.services.system_utilization"
         ".SystemUtilization.get_memory_utilization"
     )
-    @patch("rpidash.services.task_scheduler.ModelManager.store_record")
-    def test_record_memory_utilization(
+    @patch(
+        "rpidash.services.system_utilization"
+        ".SystemUtilization.get_cpu_percentage"
+    )
+    @patch(
+        "rpidash.services.system_utilization"
+        ".SystemUtilization.read_cpu_temperature"
+    )
+    @patch("rpidash.metrics.psutil.getloadavg", return_value=(0.5, 0, 0))
+    @patch("rpidash.services.task_scheduler.RecordBuffer.extend")
+    def test_collect_metrics_skips_missing_readings(  # pylint: disable=too-many-arguments
         self,
-        mock_store_record,
+        mock_extend,
+        mock_getloadavg,  # pylint: disable=unused-argument
+        mock_read_cpu_temperature,
+        mock_get_cpu_percentage,
         mock_get_memory_utilization,
     ):
-        """Test record_memory_utilization method."""
+        """Test collect_metrics skips missing readings but keeps zeros."""
+        mock_read_cpu_temperature.return_value = None
+        mock_get_cpu_percentage.return_value.cpu_percentage = 0.0
         mock_get_memory_utilization.return_value.memory_percentage = 51.0
-        self.task_scheduler.record_memory_utilization()
-        mock_store_record.assert_called_with(reading=51.0)
+        self.task_scheduler.collect_metrics()
+
+        (records,), _ = mock_extend.call_args
+        self.assertEqual(
+            [(table_name, reading) for table_name, _, reading in records],
+            [
+                ("cpu_utilization", 0.0),
+                ("memory_utilization", 51.0),
+                ("load_average", 0.5),
+            ],
+        )
+
+    @patch("rpidash.services.task_scheduler.BackgroundScheduler")
+    @patch("rpidash.services.task_scheduler.get_metrics")
+    def test_setup_tasks_metric_interval(
+        self,
+        mock_get_metrics,
+        mock_scheduler,
+    ):
+        """Test metrics with an interval are sampled by their own job."""
+        metric = Metric(
+            "cpu_temperature",
+            title="CPU Temperature",
+            unit="°C",
+            value_key="temperature",
+            sample=MagicMock(return_value=49.0),
+            interval=60,
+            model=MagicMock(),
+        )
+        mock_get_metrics.return_value = {"cpu_temperature": metric}
+        with patch(
+            "rpidash.services.task_scheduler.load_app_config",
+            return_value=self.mock_config,
+        ):
+            task_scheduler = TaskScheduler()
+        mock_scheduler.return_value.add_job.assert_any_call(
+            id="collect_cpu_temperature",
+            func=task_scheduler.collect_metrics,
+            args=[[metric]],
+            trigger="interval",
+            seconds=60,
+        )
 
+        with patch.object(task_scheduler.buffer, "extend") as mock_extend:
+            task_scheduler.collect_metrics()
+        mock_extend.assert_called_once_with([])
+
+    def test_get_collection_interval(self):
+        """Test the collection job uses the configured interval."""
+        self.assertEqual(self.task_scheduler.get_collection_interval(), 10)
+        self.mock_scheduler.add_job.assert_any_call(
+            id="collect_metrics",
+            func=self.task_scheduler.collect_metrics,
+            trigger="interval",
+            seconds=10,
+        )
+
+    def test_get_collection_interval_legacy(self):
+        """Test the shortest per-metric interval of older configs is used."""
+        self.task_scheduler.intervals = {
+            "cpu_temperature": 10,
+            "cpu_percentage": 20,
+            "memory_percentage": 30,
+        }
+        self.assertEqual(self.task_scheduler.get_collection_interval(), 10)
+
+    @patch("rpidash.services.task_scheduler.db")
     @patch("rpidash.services.task_scheduler.ModelManager.delete_records")
-    def test_delete_old_records(self, mock_delete_records):
+    def test_delete_old_records(self, mock_delete_records, mock_db):
         """Test delete_old_records method."""
         self.task_scheduler.delete_old_records()
         mock_delete_records.assert_called_with(
             older_than=self.mock_config["scheduled_tasks"]["deletion"][
                 "delete_older_than"
-            ]
+            ],
+            rollup_retention=self.mock_config["scheduled_tasks"]["deletion"][
+                "rollups"
+            ],
+            batch_size=DELETE_BATCH_SIZE,
+            pause=0,
         )
+        mock_db.incremental_vacuum.assert_called_once_with(0)
 
-    def test_start(self):
+    @patch("rpidash.services.task_scheduler.atexit")
+    @patch("rpidash.services.task_scheduler.migrate_db")
+    @patch("rpidash.services.task_scheduler.db")
+    def test_start(self, mock_db, mock_migrate_db, mock_atexit):
         """Test method that starts the task scheduler."""
         self.task_scheduler.start()
+        mock_migrate_db.assert_called_once_with(mock_db.engine)
         self.mock_scheduler.start.assert_called_once()
+        mock_atexit.register.assert_called_once_with(
+            self.task_scheduler.shutdown,
+        )
+
+    @patch("rpidash.services.task_scheduler.migrate_db")
+    @patch("rpidash.services.task_scheduler.threading.Timer")
+    @patch(
+        "rpidash.services.task_scheduler.SchedulerLock.acquire",
+        return_value=False,
+    )
+    def test_start_standby(self, mock_acquire, mock_timer, mock_migrate_db):  # pylint: disable=unused-argument
+        """Test the scheduler stands by while another process runs it."""
+        self.task_scheduler.start()
+        mock_migrate_db.assert_not_called()
+        self.mock_scheduler.start.assert_not_called()
+        mock_timer.assert_called_once_with(30, self.task_scheduler.start)
+        mock_timer.return_value.start.assert_called_once()
+
+    def test_get_lock_path(self):
+        """Test the lock file is kept next to the database by default."""
+        self.assertEqual(
+            self.task_scheduler.get_lock_path(),
+            os.path.join(tempfile.gettempdir(), "rpidash-scheduler.lock"),
+        )
+        self.task_scheduler.config["database"] = {
+            "uri": "sqlite:////data/db.sqlite3",
+        }
+        self.assertEqual(
+            self.task_scheduler.get_lock_path(),
+            "/data/scheduler.lock",
+        )
+        self.task_scheduler.lock_config = {"path": "/run/rpidash.lock"}
+        self.assertEqual(
+            self.task_scheduler.get_lock_path(),
+            "/run/rpidash.lock",
+        )
+
+    @patch("rpidash.services.task_scheduler.SchedulerLock.release")
+    @patch("rpidash.services.task_scheduler.RecordBuffer.flush")
+    def test_shutdown(self, mock_flush, mock_release):
+        """Test shutdown stops the scheduler and flushes the buffer."""
+        self.task_scheduler.shutdown()
+        self.mock_scheduler.shutdown.assert_called_once()
+        mock_flush.assert_called_once()
+        mock_release.assert_called_once()
+
+    def test_setup_tasks_flush_job(self):
+        """Test the buffer flush job uses the configured interval."""
+        self.mock_scheduler.add_job.assert_any_call(
+            id="flush_records",
+            func=self.task_scheduler.buffer.flush,
+            trigger="interval",
+            seconds=50,
+        )
+
+    def test_adapt_collection_interval(self):
+        """Test the collection job is rescheduled when readings change."""
+        self.task_scheduler.adaptive = AdaptiveInterval(
+            interval=10,
+            min_interval=0.5,
+            max_interval=60,
+            settings={"cpu": {"threshold": 5, "deadband": 1}},
+        )
+        self.task_scheduler.adapt_collection_interval({"cpu": 10.0})
+        self.mock_scheduler.reschedule_job.assert_not_called()
+
+        self.task_scheduler.adapt_collection_interval({"cpu": 30.0})
+        self.mock_scheduler.reschedule_job.assert_called_once_with(
+            "collect_metrics",
+            trigger="interval",
+            seconds=0.5,
+        )
+        self.assertEqual(self.task_scheduler.collection_interval, 0.5)
+
+    def test_apply_config_min_interval(self):
+        """Test the adaptive interval isn't shorter than the CPU window."""
+        config = dict(self.mock_config)
+        config["scheduled_tasks"] = dict(
+            self.mock_config["scheduled_tasks"],
+            adaptive={
+                "enabled": True,
+                "min_interval": 0.5,
+                "max_interval": 60,
+            },
+        )
+        config["cpu_sampler"] = {"window": 2}
+        self.task_scheduler.apply_config(config)
+        self.assertEqual(self.task_scheduler.adaptive.min_interval, 2)
+
+    @patch("rpidash.services.task_scheduler.load_app_config")
+    def test_reload_config(self, mock_load_config):
+        """Test changed intervals are applied to the running jobs."""
+        mock_load_config.return_value = self.mock_config
+        self.task_scheduler.reload_config()
+        self.mock_scheduler.reschedule_job.assert_not_called()
+
+        mock_load_config.return_value = {
+            "scheduled_tasks": {
+                "intervals": {"collection": 1, "deletion": 40},
+                "buffer": {"max_size": 10},
+                "deletion": {"enabled": True, "delete_older_than": 3},
+                "reload_interval": 30,
+            }
+        }
+        self.task_scheduler.reload_config()
+        self.mock_scheduler.reschedule_job.assert_called_once_with(
+            "collect_metrics",
+            trigger="interval",
+            seconds=1,
+        )
+        self.mock_scheduler.remove_job.assert_called_once_with(
+            "flush_records",
+        )
+        self.mock_scheduler.add_job.assert_called_with(
+            id="reload_config",
+            func=self.task_scheduler.reload_config,
+            trigger="interval",
+            seconds=30,
+        )
+        self.assertEqual(self.task_scheduler.buffer.max_size, 10)
+        self.assertEqual(
+            self.task_scheduler.delete_config["delete_older_than"],
+            3,
+        )
+
+
+class TestTaskSchedulerDatabase(unittest.TestCase):
+    """A test suite for the scheduled tasks on the test database."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test environment."""
+        cls.app = create_app()
+        cls.context = cls.app.app_context()
+        cls.context.push()
+        migrate_auto_vacuum(db.engine)
+
+    @patch("rpidash.services.task_scheduler.BackgroundScheduler")
+    def setUp(self, mock_scheduler):  # pylint: disable=arguments-differ
+        """Store expired readings spanning many pages and a recent one."""
+        self.task_scheduler = TaskScheduler()
+        self.task_scheduler.delete_config = {"delete_older_than": 86400}
+        self.mock_scheduler = mock_scheduler.return_value
+        CPUTemperature.query.delete()
+        now = datetime.now()
+        readings = [
+            (now - timedelta(days=30, seconds=index), 40.0)
+            for index in range(2000)
+        ]
+        for date, temperature in readings + [(now, 50.0)]:
+            instance = CPUTemperature(temperature=temperature)
+            instance.date = date
+            db_session.add(instance)
+        db_session.commit()
+
+    def tearDown(self):
+        """Remove the stored readings."""
+        db_session.rollback()
+        CPUTemperature.query.delete()
+        db_session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the test environment."""
+        cls.context.pop()
+
+    def test_delete_old_records(self):
+        """Test expired records are deleted and the space is returned."""
+        self.task_scheduler.delete_old_records()
+
+        data = ModelManager("cpu_temperature").retrieve_data()
+        self.assertEqual(data["values"], [50.0])
+        freelist_count = db_session.execute(
+            text("PRAGMA freelist_count"),
+        ).scalar()
+        self.assertEqual(freelist_count, 0)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,37 @@
+# STDLIB
+import unittest
+from unittest.mock import patch
+
+# FIRST PARTY
+from rpidash.services.utilization_snapshot import UtilizationSnapshot
+
+
+class TestUtilizationSnapshot(unittest.TestCase):
+    """A test suite for the shared utilization snapshot."""
+
+    @patch("rpidash.services.utilization_snapshot.time.monotonic")
+    @patch("rpidash.services.system_utilization.SystemUtilization.all")
+    def test_get_cached_within_ttl(self, mock_all, mock_monotonic):
+        """Test the snapshot is read once per TTL window."""
+        mock_all.return_value.to_dict.return_value = {"cpu_percentage": 5}
+        mock_monotonic.side_effect = [100.0, 101.0, 102.5]
+        snapshot = UtilizationSnapshot(ttl=2)
+
+        self.assertEqual(snapshot.get(), {"cpu_percentage": 5})
+        self.assertEqual(snapshot.get(), {"cpu_percentage": 5})
+        self.assertEqual(mock_all.call_count, 1)
+
+        snapshot.get()
+        self.assertEqual(mock_all.call_count, 2)
+
+    @patch("rpidash.services.system_utilization.SystemUtilization.all")
+    def test_get_without_ttl(self, mock_all):
+        """Test every call refreshes the snapshot without a TTL."""
+        snapshot = UtilizationSnapshot()
+        snapshot.get()
+        snapshot.get()
+        self.assertEqual(mock_all.call_count, 2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,29 @@
+# STDLIB
+import threading
+import time
+
+# FIRST PARTY
+from rpidash.services.system_utilization import SystemUtilization
+
+
+class UtilizationSnapshot:
+    """
+    A process-wide snapshot of the current system utilization that is
+    shared between requests and refreshed at most once per TTL.
+    """
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl
+        self.utilization = SystemUtilization()
+        self.snapshot = None
+        self.updated = 0.0
+        self.lock = threading.Lock()
+
+    def get(self) -> dict:
+        """Return the snapshot, refreshing it once it has expired."""
+        with self.lock:
+            now = time.monotonic()
+            if self.snapshot is None or now - self.updated >= self.ttl:
+                self.snapshot = self.utilization.all().to_dict()
+                self.updated = now
+            return self.snapshot
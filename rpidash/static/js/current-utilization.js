@@ -43,4 +43,10 @@ const displayCurrentUtilization = ({
 };
 
 fetchCurrentUtilization();
-setInterval(fetchCurrentUtilization, 10000);
\ No newline at end of file
+if (utilizationStream) {
+  utilizationStream.addEventListener("message", (event) => {
+    displayCurrentUtilization(JSON.parse(event.data).utilization);
+  });
+} else {
+  setInterval(fetchCurrentUtilization, 10000);
+}
\ No newline at end of file
@@ -1,91 +1,113 @@
-const fetchDataAndUpdateGraph = async (graph) => {
+const fetchDataAndUpdateGraphs = async () => {
   try {
-    let endpoint = graph.endpoint;
-    if (graph.latestDate) {
-      endpoint += `?recorded_after=${graph.latestDate}`;
+    const tables = graphs.map(graph => graph.table).join(",");
+    let endpoint = `${historyEndpoint}?tables=${tables}`;
+    const latestDates = graphs.map(graph => graph.latestDate).filter(Boolean);
+    if (latestDates.length > 0) {
+      // Readings already shown are skipped by updateGraph
+      endpoint += `&recorded_after=${latestDates.sort()[0]}`;
+    } else {
+      endpoint += `&max_points=${maxPoints}`;
     }
 
-    const response = await fetch(endpoint);
-    if (!response.ok) {
-      throw new Error("Network response was not ok");
+    let data = await fetchPage(endpoint);
+    updateGraphs(data.series);
+    while (data.next_cursor) {
+      const cursor = encodeURIComponent(data.next_cursor);
+      data = await fetchPage(`${endpoint}&cursor=${cursor}`);
+      updateGraphs(data.series);
     }
-    const data = await response.json();
+  } catch (error) {
+    console.error("There was a problem fetching the data:", error);
+  }
+};
 
-    const dates = data.dates.map(date => new Date(date));
-    const values = data.values;
+const fetchPage = async (endpoint) => {
+  const response = await fetch(endpoint);
+  if (!response.ok) {
+    throw new Error("Network response was not ok");
+  }
+  return response.json();
+};
+
+const updateGraphs = (series) => {
+  graphs.forEach(graph => {
+    if (series[graph.table]) {
+      updateGraph(graph, series[graph.table]);
+    }
+  });
+};
 
-    if (dates.length > 0) {
-      graph.dates.push(...dates)
-      graph.values.push(...values)
+const updateGraph = (graph, data) => {
+  const dates = [];
+  const values = [];
+  data.dates.forEach((date, index) => {
+    if (!graph.latestDate || date > graph.latestDate) {
+      dates.push(date);
+      values.push(data.values[index]);
+    }
+  });
 
-      const chartData = [{
-        x: graph.dates,
-        y: graph.values,
-        mode: "lines",
-        type: "scatter",
-        line: { color: "#B80C09" }
-      }];
+  if (dates.length > 0) {
+    graph.dates.push(...dates.map(date => new Date(date)))
+    graph.values.push(...values)
 
-      const layout = {
-        xaxis: { zeroline: false },
-        yaxis: { zeroline: false },
-        dragmode: "pan",
-        margin: { t: 20 },
-        font: { family: "'Prompt', sans-serif" }
-      };
+    const chartData = [{
+      x: graph.dates,
+      y: graph.values,
+      mode: "lines",
+      type: "scatter",
+      line: { color: "#B80C09" }
+    }];
 
-      const config = {
-        scrollZoom: true,
-        displayModeBar: false
-      };
+    const layout = {
+      xaxis: { zeroline: false },
+      yaxis: { zeroline: false },
+      dragmode: "pan",
+      margin: { t: 20 },
+      font: { family: "'Prompt', sans-serif" }
+    };
 
-      if (!graph.latestDate) {
-        Plotly.newPlot(graph.id, chartData, layout, config);
-        graph.initializedFlag = true;
-      } else {
-        const updatedData = { x: [graph.dates], y: [graph.values] };
-        Plotly.update(graph.id, updatedData);
-      }
+    const config = {
+      scrollZoom: true,
+      displayModeBar: false
+    };
 
-      graph.latestDate = data.dates[data.dates.length - 1];
+    if (!graph.latestDate) {
+      Plotly.newPlot(graph.id, chartData, layout, config);
+      graph.initializedFlag = true;
+    } else {
+      const updatedData = { x: [graph.dates], y: [graph.values] };
+      Plotly.update(graph.id, updatedData);
     }
-  } catch (error) {
-    console.error("There was a problem fetching the data:", error);
+
+    graph.latestDate = dates[dates.length - 1];
   }
 };
 
 const initializeGraphs = async () => {
-  for (const graph of graphs) {
-    await fetchDataAndUpdateGraph(graph);
-    setInterval(() => fetchDataAndUpdateGraph(graph), 10000);
+  await fetchDataAndUpdateGraphs();
+
+  if (utilizationStream) {
+    // Catch up on readings missed while the stream was disconnected
+    utilizationStream.addEventListener("open", fetchDataAndUpdateGraphs);
+    utilizationStream.addEventListener("message", (event) => {
+      updateGraphs(JSON.parse(event.data).readings);
+    });
+  } else {
+    setInterval(fetchDataAndUpdateGraphs, 10000);
   }
 };
 
-const graphs = [
-  {
-    endpoint: "/services/cpu_utilization",
-    id: "cpu-utilization",
-    valueKey: "percentage",
-    dates: [],
-    values: [],
-    latestDate: null
-  },
-  {
-    endpoint: "/services/cpu_temperature",
-    id: "cpu-temperature",
-    valueKey: "temperature",
-    dates: [],
-    values: [],
-    latestDate: null
-  },
-  {
-    endpoint: "/services/memory_utilization",
-    id: "memory-utilization",
-    valueKey: "percentage",
-    dates: [],
-    values: [],
-    latestDate: null
-  }
-];
+const historyEndpoint = "/services/history";
+const maxPoints = 2000;
+
+const graphs = metrics.map(metric => ({
+  table: metric.name,
+  id: metric.name,
+  dates: [],
+  values: [],
+  latestDate: null
+}));
 
 initializeGraphs();
\ No newline at end of file
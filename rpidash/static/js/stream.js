@@ -0,0 +1,3 @@
+const utilizationStream = typeof EventSource !== "undefined"
+  ? new EventSource("/services/stream")
+  : null;
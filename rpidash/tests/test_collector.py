@@ -0,0 +1,85 @@
+# STDLIB
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+# FIRST PARTY
+from rpidash.collector import main
+
+
+class TestCollector(unittest.TestCase):
+    """A test suite for the standalone collector."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.config = {
+            "scheduled_tasks": {"enabled": True},
+            "logging": {"level": "ERROR"},
+            "database": {"uri": "sqlite://"},
+        }
+
+    @patch("rpidash.collector.signal")
+    @patch("rpidash.collector.threading.Event")
+    @patch("rpidash.collector.TaskScheduler")
+    @patch("rpidash.collector.setup_db")
+    @patch("rpidash.collector.load_app_config")
+    def test_main(
+        self,
+        mock_load_config,
+        mock_setup_db,
+        mock_task_scheduler,
+        mock_event,
+        mock_signal,
+    ):  # pylint: disable=too-many-arguments,unused-argument
+        """Test main runs the scheduler until it is stopped."""
+        mock_load_config.return_value = self.config
+        main()
+
+        mock_setup_db.assert_called_once_with({"uri": "sqlite://"})
+        mock_task_scheduler.return_value.start.assert_called_once()
+        mock_event.return_value.wait.assert_called_once()
+        mock_task_scheduler.return_value.shutdown.assert_called_once()
+        signal_numbers = [
+            args[0] for args, _ in mock_signal.signal.call_args_list
+        ]
+        self.assertIn(mock_signal.SIGHUP, signal_numbers)
+
+    @patch("rpidash.collector.TaskScheduler")
+    @patch("rpidash.collector.setup_db")
+    @patch("rpidash.collector.load_app_config")
+    def test_main_disabled(
+        self,
+        mock_load_config,
+        mock_setup_db,
+        mock_task_scheduler,
+    ):
+        """Test main exits when the scheduled tasks are disabled."""
+        self.config["scheduled_tasks"]["enabled"] = False
+        mock_load_config.return_value = self.config
+        main()
+
+        mock_setup_db.assert_not_called()
+        mock_task_scheduler.assert_not_called()
+
+    def test_import_without_web_app(self):
+        """Test the collector doesn't import the web app dependencies."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, rpidash.collector; "
+                "print(any(module.split('.')[0] in ('flask', 'jinja2')"
+                " for module in sys.modules))",
+            ],
+            capture_output=True,
+            check=True,
+            env=os.environ,
+            text=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,65 @@
+# STDLIB
+import os
+import tempfile
+import unittest
+
+# THIRD PARTY
+from sqlalchemy import text
+
+# FIRST PARTY
+from rpidash.database import create_db_engine
+
+
+class TestDatabase(unittest.TestCase):
+    """A test suite for the database engine setup."""
+
+    def setUp(self):
+        """Set up a temporary database file path."""
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.uri = "sqlite:///" + os.path.join(
+            self.directory.name,
+            "db.sqlite3",
+        )
+
+    def tearDown(self):
+        """Remove the temporary database."""
+        self.directory.cleanup()
+
+    def test_create_db_engine_pragmas(self):
+        """Test the pragmas are set on every new connection."""
+        engine = create_db_engine(
+            self.uri,
+            pragmas={
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+                "busy_timeout": 1234,
+            },
+        )
+        with engine.connect() as connection:
+            journal_mode = connection.execute(
+                text("PRAGMA journal_mode"),
+            ).scalar()
+            synchronous = connection.execute(
+                text("PRAGMA synchronous"),
+            ).scalar()
+            busy_timeout = connection.execute(
+                text("PRAGMA busy_timeout"),
+            ).scalar()
+        engine.dispose()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)
+        self.assertEqual(busy_timeout, 1234)
+
+    def test_create_db_engine_pool(self):
+        """Test the connection pool options are passed to the engine."""
+        engine = create_db_engine(
+            self.uri,
+            pool={"pool_size": 3, "max_overflow": 1},
+        )
+        self.assertEqual(engine.pool.size(), 3)
+        engine.dispose()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,42 @@
+# STDLIB
+import unittest
+from unittest.mock import MagicMock, patch
+
+# FIRST PARTY
+from rpidash.database import Base
+from rpidash.metrics import Metric, get_metrics, register_metric
+from rpidash.models.model_manager import ModelManager
+
+
+class TestMetrics(unittest.TestCase):
+    """A test suite for the metric registry."""
+
+    def test_register_metric(self):
+        """Test registered metrics are stored by a created model."""
+        metric = Metric(
+            "disk_io",
+            title="Disk I/O",
+            unit="MB/s",
+            value_key="rate",
+            sample=MagicMock(return_value=1.5),
+        )
+        with patch.dict("rpidash.metrics.METRICS"):
+            register_metric(metric)
+            self.assertIs(ModelManager("disk_io").model, metric.model)
+            with self.assertRaises(ValueError):
+                register_metric(metric)
+        self.assertNotIn("disk_io", get_metrics())
+
+        self.assertEqual(metric.model.__tablename__, "disk_io")
+        self.assertEqual(metric.model.get_value_key(), "rate")
+        self.assertEqual(metric.model(2.5).rate, 2.5)
+        Base.metadata.remove(metric.model.__table__)
+
+    @patch("rpidash.metrics.psutil.getloadavg", return_value=(0.456, 0, 0))
+    def test_sample_load_average(self, mock_getloadavg):  # pylint: disable=unused-argument
+        """Test the load average is sampled over the last minute."""
+        self.assertEqual(get_metrics()["load_average"].sample(), 0.46)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -1,10 +1,16 @@
 # STDLIB
 import os
+import tempfile
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, mock_open, patch
 
 # FIRST PARTY
-from rpidash.utils.utils import get_project_version, load_app_config
+from rpidash.utils.utils import (
+    clear_cache,
+    get_project_version,
+    load_app_config,
+    load_cached,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -93,6 +99,27 @@ class TestUtils(unittest.TestCase):
         )
         self.assertEqual(result, "1.0")
 
+    def test_load_cached(self):
+        """Test files are parsed again only after they have changed."""
+        with tempfile.NamedTemporaryFile("w", delete=False) as file:
+            file.write("a")
+        self.addCleanup(os.remove, file.name)
+        self.addCleanup(clear_cache)
+        loader = MagicMock(side_effect=lambda file: file.read())
+
+        self.assertEqual(load_cached(file.name, loader), "a")
+        self.assertEqual(load_cached(file.name, loader), "a")
+        self.assertEqual(loader.call_count, 1)
+
+        with open(file.name, "w", encoding="utf-8") as changed_file:
+            changed_file.write("b")
+        os.utime(file.name, ns=(0, 0))
+        self.assertEqual(load_cached(file.name, loader), "b")
+
+        clear_cache()
+        load_cached(file.name, loader)
+        self.assertEqual(loader.call_count, 3)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -1,13 +1,45 @@
 # STDLIB
 import os
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
 
 # THIRD PARTY
 import toml
 import yaml
 
+cache: Dict[str, Tuple[int, Any]] = {}
+
+
+def load_cached(path: str, loader: Callable[[TextIO], Any]) -> Any:
+    """
+    Load the file with the loader, reusing the loaded contents until the
+    file's modification time changes or the cache is cleared. The shared
+    contents must not be modified.
+    """
+    mtime: Optional[int]
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = cache.get(path)
+    if mtime is not None and cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as file:
+        contents = loader(file)
+    if mtime is not None:
+        cache[path] = (mtime, contents)
+    return contents
+
+
+def clear_cache() -> None:
+    """Forget the loaded files, so that they are read again on next use."""
+    cache.clear()
+
 
 def load_app_config() -> dict:
-    """Load app configuration from YAML file."""
+    """
+    Load app configuration from YAML file, parsed once per process until
+    the file changes.
+    """
     environment = os.environ["FLASK_ENV"]
     dir_path = os.path.dirname(
         os.path.dirname(
@@ -24,13 +56,14 @@ def load_app_config() -> dict:
         config_path = os.path.join(dir_path, "config.test.yaml")
     else:
         raise ValueError(f"Invalid environment provided: {environment}")
-    with open(config_path, "r", encoding="utf-8") as file:
-        config = yaml.safe_load(file)
-    return config
+    return load_cached(config_path, yaml.safe_load)
 
 
 def get_project_version() -> str:
-    """Get project version from pyproject.toml."""
+    """
+    Get project version from pyproject.toml, parsed once per process
+    until the file changes.
+    """
     dir_path = os.path.dirname(
         os.path.dirname(
             os.path.dirname(
@@ -39,7 +72,5 @@ def get_project_version() -> str:
         )
     )
     pyproject_path = os.path.join(dir_path, "pyproject.toml")
-    with open(pyproject_path, "r", encoding="utf-8") as file:
-        pyproject = toml.load(file)
-    version = pyproject["project"]["version"]
-    return version
+    pyproject = load_cached(pyproject_path, toml.load)
+    return pyproject["project"]["version"]
@@ -1,14 +1,35 @@
 # STDLIB
+import json
+import queue
 from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # THIRD PARTY
-from flask import jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask.typing import ResponseReturnValue
 from flask.views import View
+from sqlalchemy.sql import Select
 
 # FIRST PARTY
-from rpidash.models.model_manager import ModelManager
-from rpidash.services.system_utilization import SystemUtilization
+from rpidash.models.model_manager import MAX_POINTS, ModelManager
+from rpidash.services.broadcaster import Broadcaster
+from rpidash.services.ring_buffer import RecentReadings
+from rpidash.services.utilization_snapshot import UtilizationSnapshot
+from rpidash.views.caching import conditional_response, make_etag
+from rpidash.views.encoding import (
+    encode_binary,
+    encode_compact,
+    stream_csv,
+    stream_json_columns,
+    stream_ndjson,
+)
+
+HISTORY_FORMATS = ("json", "compact", "binary")
+MULTI_HISTORY_FORMATS = ("json", "compact")
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+KEEPALIVE_INTERVAL = 15
 
 
 class UtilizationBase(ABC, View):
@@ -18,7 +39,10 @@ class UtilizationBase(ABC, View):
         """Render API view."""
         kwargs.update(request.args)
         try:
-            return jsonify(self.prepare_response(**kwargs))
+            return self.render_response(
+                self.prepare_response(**kwargs),
+                **kwargs,
+            )
         except ValueError as exc:
             response = {
                 "error": f"Failed to retrieve data: {exc}"
@@ -29,20 +53,295 @@ class UtilizationBase(ABC, View):
     def prepare_response(self, **kwargs):
         """Prepare JSON response."""
 
+    def render_response(self, data, **kwargs) -> ResponseReturnValue:
+        """Render the prepared response as JSON."""
+        # pylint: disable=unused-argument
+        return jsonify(data)
+
 
 class CurrentUtilization(UtilizationBase):
     """Current system utilization view."""
 
+    def __init__(self, snapshot: Optional[UtilizationSnapshot] = None):
+        self.snapshot = snapshot or UtilizationSnapshot()
+
     def prepare_response(self, **kwargs) -> dict:
         """Prepare current system utilization JSON response."""
-        return SystemUtilization().all().to_dict()
+        return self.snapshot.get()
 
 
 class UtilizationHistory(UtilizationBase):
-    """System utilization history view."""
+    """
+    System utilization history view. The response format is selected
+    with the format parameter or negotiated from the Accept header.
+    With the stream parameter, the raw JSON history is written in chunks
+    as it is read from the database instead of being built in memory.
+    Responses carry validators derived from the stored readings, so the
+    clients' conditional requests are answered without querying them.
+    The raw readings of the recent history are read from memory.
+    """
 
-    def prepare_response(self, **kwargs) -> dict:
+    def __init__(
+        self,
+        page_size: int = MAX_POINTS,
+        recent: Optional[RecentReadings] = None,
+    ):
+        self.page_size = page_size
+        self.recent = recent
+
+    def dispatch_request(self, **kwargs) -> ResponseReturnValue:
+        """Render API view in the negotiated format."""
+        if "format" not in request.args:
+            best_match = request.accept_mimetypes.best_match(
+                ["application/json", "application/octet-stream"],
+                default="application/json",
+            )
+            if best_match == "application/octet-stream":
+                kwargs["format"] = "binary"
+        try:
+            validators, last_modified = self.get_cache_validators(**kwargs)
+        except ValueError:
+            return super().dispatch_request(**kwargs)
+        response = conditional_response(
+            partial(super().dispatch_request, **kwargs),
+            make_etag(
+                validators,
+                request.args.get("format", kwargs.get("format")),
+            ),
+            last_modified,
+        )
+        response.vary.add("Accept")
+        return response
+
+    def get_cache_validators(
+        self,
+        **kwargs,
+    ) -> Tuple[tuple, Optional[datetime]]:
+        """Return the validators of the requested history."""
+        return ModelManager(kwargs["table_name"]).get_cache_validators()
+
+    @staticmethod
+    def is_streamed(**kwargs) -> bool:
+        """Return whether the streaming mode is requested."""
+        return kwargs.get("stream") in ("1", "true")
+
+    def prepare_response(self, **kwargs):
         """Prepare system utilization history JSON response."""
+        response_format = kwargs.get("format", "json")
+        if response_format not in HISTORY_FORMATS:
+            raise ValueError(
+                "The 'format' parameter must be one of: "
+                f"{', '.join(HISTORY_FORMATS)}"
+            )
+        if self.is_streamed(**kwargs):
+            if response_format != "json":
+                raise ValueError("Only the 'json' format can be streamed")
+            if kwargs.get("bucket") or kwargs.get("max_points"):
+                raise ValueError("Only the raw readings can be streamed")
+            return ModelManager(kwargs["table_name"]).export_statement(
+                recorded_after=kwargs.get("recorded_after"),
+                start=kwargs.get("start"),
+                end=kwargs.get("end"),
+            )
+        if self.recent and not any(
+            kwargs.get(name) for name in ("max_points", "bucket", "cursor")
+        ):
+            data = self.recent.get(
+                kwargs["table_name"],
+                recorded_after=kwargs.get("recorded_after"),
+                start=kwargs.get("start"),
+                end=kwargs.get("end"),
+                epoch_dates=response_format != "json",
+                page_size=kwargs.get("page_size") or self.page_size,
+            )
+            if data is not None:
+                return data
         return ModelManager(kwargs["table_name"]).retrieve_data(
-            kwargs.get("recorded_after"),
+            recorded_after=kwargs.get("recorded_after"),
+            start=kwargs.get("start"),
+            end=kwargs.get("end"),
+            max_points=kwargs.get("max_points"),
+            bucket=kwargs.get("bucket"),
+            epoch_dates=response_format != "json",
+            cursor=kwargs.get("cursor"),
+            page_size=kwargs.get("page_size") or self.page_size,
         )
+
+    def render_response(self, data, **kwargs) -> ResponseReturnValue:
+        """Render the history in the requested format."""
+        if self.is_streamed(**kwargs):
+            return Response(
+                stream_with_context(stream_json_columns(
+                    ("dates", "values"),
+                    ModelManager.iterate_chunks(data),
+                )),
+                mimetype="application/json",
+            )
+        response_format = kwargs.get("format", "json")
+        if response_format == "compact":
+            return jsonify(encode_compact(data))
+        if response_format == "binary":
+            response = Response(
+                encode_binary(data),
+                mimetype="application/octet-stream",
+            )
+            if data.get("next_cursor"):
+                response.headers["X-Next-Cursor"] = data["next_cursor"]
+            return response
+        return jsonify(data)
+
+
+class MultiUtilizationHistory(UtilizationHistory):
+    """
+    System utilization history of several metrics in one response. The
+    tables parameter lists the comma-separated table names, which share
+    the date range and the other parameters. All series are read through
+    the request's database session, i.e. on a single connection within
+    one transaction. The next_cursor continues the series that have more
+    pages.
+    """
+
+    @staticmethod
+    def parse_tables(tables: Optional[str]) -> List[str]:
+        """Parse the tables parameter, dropping repeated table names."""
+        if not tables:
+            raise ValueError("The 'tables' parameter is required")
+        return list(dict.fromkeys(tables.split(",")))
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Dict[str, str]:
+        """Decode the cursors of the series keyed by their table names."""
+        cursors = {}
+        for part in filter(None, (cursor or "").split(",")):
+            table_name, separator, table_cursor = part.partition(":")
+            if not separator:
+                raise ValueError("The 'cursor' parameter is invalid")
+            cursors[table_name] = table_cursor
+        return cursors
+
+    def get_cache_validators(
+        self,
+        **kwargs,
+    ) -> Tuple[tuple, Optional[datetime]]:
+        """Return the validators of the histories of all tables."""
+        validators = []
+        last_modified = None
+        for table_name in self.parse_tables(request.args.get("tables")):
+            table_validators, table_modified = ModelManager(
+                table_name,
+            ).get_cache_validators()
+            validators.append(table_validators)
+            last_modified = max(
+                filter(None, (last_modified, table_modified)),
+                default=None,
+            )
+        return tuple(validators), last_modified
+
+    def prepare_response(self, **kwargs) -> dict:
+        """Prepare the histories of all tables as a single response."""
+        if kwargs.get("format", "json") not in MULTI_HISTORY_FORMATS:
+            raise ValueError(
+                "The 'format' parameter must be one of: "
+                f"{', '.join(MULTI_HISTORY_FORMATS)}"
+            )
+        if self.is_streamed(**kwargs):
+            raise ValueError("Only the history of one table can be streamed")
+        cursors = self.decode_cursor(kwargs.get("cursor"))
+        series = {}
+        next_cursors = []
+        for table_name in self.parse_tables(kwargs.get("tables")):
+            if cursors and table_name not in cursors:
+                continue
+            data = super().prepare_response(**{
+                **kwargs,
+                "table_name": table_name,
+                "cursor": cursors.get(table_name),
+            })
+            next_cursor = data.pop("next_cursor", None)
+            if next_cursor:
+                next_cursors.append(f"{table_name}:{next_cursor}")
+            series[table_name] = data
+        return {
+            "series": series,
+            "next_cursor": ",".join(next_cursors) or None,
+        }
+
+    def render_response(self, data, **kwargs) -> ResponseReturnValue:
+        """Render the histories in the requested format."""
+        if kwargs.get("format") == "compact":
+            data["series"] = {
+                table_name: encode_compact(table_data)
+                for table_name, table_data in data["series"].items()
+            }
+        return jsonify(data)
+
+
+class UtilizationExport(UtilizationBase):
+    """
+    Export of the raw system utilization history as CSV or NDJSON. The
+    rows are written in chunks as they are read from the database, so
+    the memory use does not depend on the size of the export.
+    """
+
+    def prepare_response(self, **kwargs) -> Select:
+        """Prepare the statement selecting the exported readings."""
+        if kwargs.get("format", "csv") not in EXPORT_FORMATS:
+            raise ValueError(
+                "The 'format' parameter must be one of: "
+                f"{', '.join(EXPORT_FORMATS)}"
+            )
+        return ModelManager(kwargs["table_name"]).export_statement(
+            recorded_after=kwargs.get("recorded_after"),
+            start=kwargs.get("start"),
+            end=kwargs.get("end"),
+        )
+
+    def render_response(self, data, **kwargs) -> ResponseReturnValue:
+        """Stream the exported readings in the requested format."""
+        export_format = kwargs.get("format", "csv")
+        table_name = kwargs["table_name"]
+        keys = ("date", ModelManager(table_name).value_key)
+        chunks = ModelManager.iterate_chunks(data)
+        if export_format == "ndjson":
+            body = stream_ndjson(keys, chunks)
+        else:
+            body = stream_csv(keys, chunks)
+        return Response(
+            stream_with_context(body),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition":
+                    f"attachment; filename={table_name}.{export_format}",
+            },
+        )
+
+
+class UtilizationStream(View):
+    """Server-sent events stream of new readings and utilization."""
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+
+    def dispatch_request(self) -> ResponseReturnValue:
+        """Stream the broadcasted messages to the client."""
+        return Response(
+            self.generate_events(self.broadcaster.subscribe()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    def generate_events(self, subscriber: queue.Queue) -> Iterator[str]:
+        """
+        Yield the subscriber's messages as events, sending comments to
+        keep the connection open while there are none.
+        """
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
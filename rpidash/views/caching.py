@@ -0,0 +1,42 @@
+# STDLIB
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+# THIRD PARTY
+from flask import Response, make_response, request
+from flask.typing import ResponseReturnValue
+from werkzeug.http import generate_etag, is_resource_modified
+
+
+def make_etag(*values) -> str:
+    """Return an entity tag identifying the given values."""
+    return generate_etag(repr(values).encode())
+
+
+def conditional_response(
+    render: Callable[[], ResponseReturnValue],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """
+    Return 304 Not Modified when the client's cached copy matches the
+    validators, without rendering the response, otherwise the rendered
+    response. The validators are set on successful responses, and the
+    clients are asked to revalidate their copy on every use.
+    """
+    if last_modified:
+        last_modified = last_modified.astimezone(timezone.utc)
+    if is_resource_modified(
+        request.environ,
+        etag=etag,
+        last_modified=last_modified,
+    ):
+        response = make_response(render())
+        if response.status_code != 200:
+            return response
+    else:
+        response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
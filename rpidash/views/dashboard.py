@@ -4,11 +4,18 @@ from flask.typing import ResponseReturnValue
 from flask.views import View
 
 # FIRST PARTY
+from rpidash.metrics import get_metrics
 from rpidash.utils.utils import get_project_version
+from rpidash.views.caching import conditional_response, make_etag
 
 
 class Dashboard(View):
-    """Dashboard view."""
+    """
+    Dashboard view. The template context is set up once, when the view
+    function is created, instead of on every request.
+    """
+
+    init_every_request = False
 
     def __init__(self):
         self.context = {}
@@ -17,7 +24,16 @@ class Dashboard(View):
     def setup_context(self):
         """Setup template context."""
         self.context["version"] = get_project_version()
+        self.context["metrics"] = [
+            metric.to_dict() for metric in get_metrics().values()
+        ]
 
     def dispatch_request(self) -> ResponseReturnValue:
-        """Render dashboard template view."""
-        return render_template("dashboard.html", **self.context)
+        """
+        Render dashboard template view, unless the client's cached copy
+        is of the same version.
+        """
+        return conditional_response(
+            lambda: render_template("dashboard.html", **self.context),
+            make_etag(self.context["version"]),
+        )
@@ -0,0 +1,155 @@
+# STDLIB
+import csv
+import gzip
+import io
+import json
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import ExitStack
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+# THIRD PARTY
+from flask import Response, request
+
+SERIES_KEYS = ("values", "min", "max")
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/octet-stream"}
+# Streamed columns are spooled in memory up to this size, then on disk
+SPOOL_MAX_SIZE = 1 << 20
+SPOOL_BLOCK_SIZE = 1 << 16
+
+
+def encode_compact(data: Dict[str, List]) -> Dict[str, List]:
+    """
+    Encode history data with epoch dates as compact JSON, replacing the
+    dates with the first timestamp followed by the deltas between the
+    consecutive timestamps.
+    """
+    dates = data["dates"]
+    compact = {
+        "timestamps": dates[:1] + [
+            date - previous for previous, date in zip(dates, dates[1:])
+        ],
+    }
+    compact.update(
+        (key, value) for key, value in data.items() if key != "dates"
+    )
+    return compact
+
+
+def encode_binary(data: Dict[str, List]) -> bytes:
+    """
+    Encode history data with epoch dates as packed little-endian arrays:
+    the point count and the series count as uint32, the timestamps as
+    int32 and each series of values, minimums and maximums as float32.
+    """
+    series = [data[key] for key in SERIES_KEYS if key in data]
+    arrays = [array("i", data["dates"])]
+    arrays.extend(array("f", values) for values in series)
+    if sys.byteorder == "big":  # pragma: no cover
+        for values in arrays:
+            values.byteswap()
+    header = struct.pack("<II", len(data["dates"]), len(series))
+    return header + b"".join(values.tobytes() for values in arrays)
+
+
+def stream_csv(
+    header: Sequence[str],
+    chunks: Iterable[Sequence[Sequence]],
+) -> Iterator[str]:
+    """Encode chunks of rows as CSV, yielding the text of every chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(
+    keys: Sequence[str],
+    chunks: Iterable[Sequence[Sequence]],
+) -> Iterator[str]:
+    """
+    Encode chunks of rows as newline-delimited JSON objects with the
+    given keys, yielding the text of every chunk.
+    """
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(dict(zip(keys, row))) + "\n" for row in chunk
+        )
+
+
+def stream_json_columns(
+    keys: Sequence[str],
+    chunks: Iterable[Sequence[Sequence]],
+) -> Iterator[str]:
+    """
+    Encode chunks of rows as a JSON object with a list of the values of
+    every column under the given keys, yielding the text of every chunk.
+    The first column is yielded as the rows arrive and the others are
+    spooled until all rows were read, so the rows are read in one pass.
+    """
+    if not keys:
+        yield "{}"
+        return
+    with ExitStack() as stack:
+        spools = [
+            stack.enter_context(tempfile.SpooledTemporaryFile(
+                max_size=SPOOL_MAX_SIZE,
+                mode="w+",
+            ))
+            for _ in keys[1:]
+        ]
+        yield f"{{{json.dumps(keys[0])}: ["
+        separator = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            first, *others = zip(*chunk)
+            yield separator + json.dumps(first)[1:-1]
+            for spool, column in zip(spools, others):
+                spool.write(separator + json.dumps(column)[1:-1])
+            separator = ", "
+        yield "]"
+        for key, spool in zip(keys[1:], spools):
+            yield f", {json.dumps(key)}: ["
+            spool.seek(0)
+            yield from iter(partial(spool.read, SPOOL_BLOCK_SIZE), "")
+            yield "]"
+        yield "}"
+
+
+def compress_response(
+    response: Response,
+    min_size: int = 1024,
+    level: int = 6,
+) -> Response:
+    """
+    Compress API responses with gzip when the client accepts it and the
+    response is large enough to benefit from it.
+    """
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code != 200
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    if (
+        "Content-Encoding" in response.headers
+        or "gzip" not in request.accept_encodings
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=level))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
@@ -1,13 +1,17 @@
 # STDLIB
+import queue
 import unittest
 from unittest.mock import MagicMock, patch
 
 # FIRST PARTY
 from rpidash import create_app
+from rpidash.models.model_manager import MAX_POINTS, ModelManager
 from rpidash.views.api_views import (
     CurrentUtilization,
+    MultiUtilizationHistory,
     UtilizationBase,
     UtilizationHistory,
+    UtilizationStream,
 )
 
 
@@ -95,9 +99,252 @@ class TestUtilizationHistory(unittest.TestCase):
         self.assertEqual(response, expected_response)
         mock_model_manager.assert_called_once_with("test")
         mock_model_manager.return_value.retrieve_data.assert_called_once_with(
-            "2024-01-01",
+            recorded_after="2024-01-01",
+            start=None,
+            end=None,
+            max_points=None,
+            bucket=None,
+            epoch_dates=False,
+            cursor=None,
+            page_size=MAX_POINTS,
         )
 
+    @patch("rpidash.views.api_views.ModelManager")
+    def test_prepare_response_recent(self, mock_model_manager):
+        """Test the recent raw history is read from memory."""
+        recent = MagicMock()
+        recent.get.return_value = {"values": [50.0], "dates": ["2024-01-01"]}
+        history = UtilizationHistory(page_size=100, recent=recent)
+
+        response = history.prepare_response(
+            table_name="test",
+            recorded_after="2024-01-01",
+        )
+        self.assertEqual(response, recent.get.return_value)
+        recent.get.assert_called_once_with(
+            "test",
+            recorded_after="2024-01-01",
+            start=None,
+            end=None,
+            epoch_dates=False,
+            page_size=100,
+        )
+        mock_model_manager.assert_not_called()
+
+        recent.get.return_value = None
+        history.prepare_response(table_name="test", start="2023-01-01")
+        mock_model_manager.return_value.retrieve_data.assert_called_once()
+
+        history.prepare_response(table_name="test", max_points="10")
+        self.assertEqual(recent.get.call_count, 2)
+
+    @patch("rpidash.views.api_views.ModelManager")
+    def test_prepare_response_invalid_format(self, mock_model_manager):
+        """Test prepare_response rejects unknown formats."""
+        with self.assertRaises(ValueError):
+            UtilizationHistory().prepare_response(
+                table_name="test",
+                format="xml",
+            )
+        mock_model_manager.assert_not_called()
+
+    @patch("rpidash.views.api_views.ModelManager")
+    def test_dispatch_request_formats(self, mock_model_manager):
+        """Test the history is rendered in the negotiated format."""
+        mock_model_manager.return_value.retrieve_data.return_value = {
+            "values": [50.0, 51.0],
+            "dates": [1704110400, 1704110410],
+        }
+        client = create_app().test_client()
+
+        response = client.get("/services/test?format=compact")
+        self.assertEqual(
+            response.json,
+            {"timestamps": [1704110400, 10], "values": [50.0, 51.0]},
+        )
+
+        response = client.get(
+            "/services/test",
+            headers={"Accept": "application/octet-stream"},
+        )
+        self.assertEqual(response.mimetype, "application/octet-stream")
+        self.assertEqual(len(response.data), 8 + 2 * 4 * 2)
+        _, kwargs = mock_model_manager.return_value.retrieve_data.call_args
+        self.assertTrue(kwargs["epoch_dates"])
+
+    @patch("rpidash.views.api_views.ModelManager")
+    def test_prepare_response_stream(self, mock_model_manager):
+        """Test the streaming mode only accepts raw JSON history."""
+        history = UtilizationHistory()
+        for kwargs in ({"format": "compact"}, {"bucket": "1m"}):
+            with self.assertRaises(ValueError):
+                history.prepare_response(
+                    table_name="test",
+                    stream="1",
+                    **kwargs,
+                )
+        response = history.prepare_response(table_name="test", stream="true")
+        self.assertEqual(
+            response,
+            mock_model_manager.return_value.export_statement.return_value,
+        )
+        mock_model_manager.return_value.retrieve_data.assert_not_called()
+
+    def test_dispatch_request_stream(self):
+        """Test the streamed history matches the regular response."""
+        client = create_app().test_client()
+        response = client.get("/services/cpu_temperature?stream=1")
+        self.assertTrue(response.is_streamed)
+        expected = client.get("/services/cpu_temperature").json
+        del expected["next_cursor"]
+        self.assertEqual(response.json, expected)
+
+    def test_dispatch_request_not_modified(self):
+        """Test unchanged history is answered with 304 Not Modified."""
+        client = create_app().test_client()
+        response = client.get("/services/cpu_temperature")
+        self.assertTrue(response.cache_control.no_cache)
+        self.assertIn("Accept", response.vary)
+
+        with patch.object(ModelManager, "retrieve_data") as mock_retrieve:
+            response = client.get(
+                "/services/cpu_temperature",
+                headers={"If-None-Match": response.headers["ETag"]},
+            )
+            mock_retrieve.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+
+        response = client.get(
+            "/services/cpu_temperature?format=compact",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_dispatch_request_unknown_table(self):
+        """Test unknown tables are rejected without validators."""
+        response = create_app().test_client().get("/services/test")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("ETag", response.headers)
+
+
+class TestMultiUtilizationHistory(unittest.TestCase):
+    """A test suite for the MultiUtilizationHistory class."""
+
+    def test_dispatch_request(self):
+        """Test the histories of all tables are returned together."""
+        client = create_app().test_client()
+        response = client.get(
+            "/services/history?tables=cpu_temperature,memory_utilization",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.json["series"]),
+            ["cpu_temperature", "memory_utilization"],
+        )
+        self.assertIn("ETag", response.headers)
+
+        for query in ("", "?tables=cpu_temperature,test"):
+            response = client.get(f"/services/history{query}")
+            self.assertEqual(response.status_code, 400)
+
+    @patch("rpidash.views.api_views.ModelManager")
+    def test_prepare_response_cursor(self, mock_model_manager):
+        """Test the cursor only continues the series with more pages."""
+        retrieve_data = mock_model_manager.return_value.retrieve_data
+        retrieve_data.side_effect = [
+            {"values": [50.0], "dates": ["2024-01-01"], "next_cursor": "a"},
+            {"values": [60.0], "dates": ["2024-01-01"], "next_cursor": None},
+            {"values": [51.0], "dates": ["2024-01-02"], "next_cursor": None},
+        ]
+        history = MultiUtilizationHistory()
+
+        response = history.prepare_response(tables="cpu,memory")
+        self.assertEqual(response["next_cursor"], "cpu:a")
+        self.assertEqual(
+            response["series"]["memory"],
+            {"values": [60.0], "dates": ["2024-01-01"]},
+        )
+
+        response = history.prepare_response(
+            tables="cpu,memory",
+            cursor="cpu:a",
+        )
+        self.assertEqual(list(response["series"]), ["cpu"])
+        self.assertEqual(retrieve_data.call_args.kwargs["cursor"], "a")
+
+        with self.assertRaises(ValueError):
+            history.prepare_response(tables="cpu", cursor="a")
+
+
+class TestUtilizationExport(unittest.TestCase):
+    """A test suite for the UtilizationExport class."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.client = create_app().test_client()
+
+    def test_export_csv(self):
+        """Test the readings are exported as a CSV attachment."""
+        response = self.client.get("/services/cpu_temperature/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertEqual(
+            response.headers["Content-Disposition"],
+            "attachment; filename=cpu_temperature.csv",
+        )
+        self.assertTrue(response.text.startswith("date,temperature\n"))
+
+    def test_export_ndjson(self):
+        """Test the readings are exported as NDJSON."""
+        response = self.client.get(
+            "/services/cpu_utilization/export?format=ndjson",
+        )
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+
+    def test_export_invalid_format(self):
+        """Test unknown export formats are rejected."""
+        response = self.client.get(
+            "/services/cpu_temperature/export?format=xml",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestUtilizationStream(unittest.TestCase):
+    """A test suite for the UtilizationStream class."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.broadcaster = MagicMock()
+        self.subscriber = queue.Queue()
+        self.broadcaster.subscribe.return_value = self.subscriber
+        self.stream = UtilizationStream(self.broadcaster)
+
+    def test_dispatch_request(self):
+        """Test dispatch_request returns an event stream response."""
+        self.subscriber.put({"utilization": {"cpu_percentage": 5.0}})
+        with create_app().test_request_context():
+            response = self.stream.dispatch_request()
+            event = next(response.response)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertEqual(
+            event,
+            'data: {"utilization": {"cpu_percentage": 5.0}}\n\n',
+        )
+
+    @patch("rpidash.views.api_views.KEEPALIVE_INTERVAL", 0)
+    def test_generate_events_keepalive(self):
+        """Test a comment is sent while there are no messages."""
+        events = self.stream.generate_events(self.subscriber)
+        self.assertEqual(next(events), ": keep-alive\n\n")
+
+    def test_generate_events_unsubscribes(self):
+        """Test the subscriber is removed when the client disconnects."""
+        self.subscriber.put({"data": "example"})
+        events = self.stream.generate_events(self.subscriber)
+        next(events)
+        events.close()
+        self.broadcaster.unsubscribe.assert_called_once_with(self.subscriber)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,60 @@
+# STDLIB
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# THIRD PARTY
+from flask import Flask
+
+# FIRST PARTY
+from rpidash.views.caching import conditional_response, make_etag
+
+
+class TestCaching(unittest.TestCase):
+    """A test suite for the conditional responses."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.app = Flask(__name__)
+        self.etag = make_etag("cpu_temperature", 1, 2)
+        self.render = MagicMock(return_value="body")
+
+    def test_make_etag(self):
+        """Test entity tags depend on all the values."""
+        self.assertEqual(make_etag("cpu_temperature", 1, 2), self.etag)
+        self.assertNotEqual(make_etag("cpu_temperature", 1, 3), self.etag)
+
+    def test_conditional_response(self):
+        """Test the rendered response carries the validators."""
+        with self.app.test_request_context():
+            response = conditional_response(
+                self.render,
+                self.etag,
+                datetime(2024, 1, 1, 12, 0, 0),
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag(), (self.etag, True))
+        self.assertIsNotNone(response.last_modified)
+        self.assertTrue(response.cache_control.no_cache)
+
+    def test_conditional_response_not_modified(self):
+        """Test a matching cached copy is not rendered again."""
+        with self.app.test_request_context(
+            headers={"If-None-Match": f'W/"{self.etag}"'},
+        ):
+            response = conditional_response(self.render, self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag(), (self.etag, True))
+        self.render.assert_not_called()
+
+    def test_conditional_response_error(self):
+        """Test error responses are returned without validators."""
+        self.render.return_value = ("error", 400)
+        with self.app.test_request_context():
+            response = conditional_response(self.render, self.etag)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("ETag", response.headers)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -3,6 +3,8 @@ import unittest
 from unittest.mock import patch
 
 # FIRST PARTY
+from rpidash import create_app
+from rpidash.views.caching import make_etag
 from rpidash.views.dashboard import Dashboard
 
 
@@ -14,18 +16,47 @@ class TestDashboard(unittest.TestCase):
         """Test setup_context method."""
         dashboard = Dashboard()
         self.assertEqual(dashboard.context["version"], "1.0")
+        self.assertEqual(
+            dashboard.context["metrics"][0],
+            {
+                "name": "cpu_temperature",
+                "title": "CPU Temperature",
+                "unit": "°C",
+            },
+        )
 
-    @patch("rpidash.views.dashboard.render_template")
+    @patch("rpidash.views.dashboard.render_template", return_value="page")
     @patch("rpidash.views.dashboard.Dashboard.setup_context")
     def test_dispatch_request(self, mock_setup_context, mock_render_template):  # pylint: disable=unused-argument
         """Test dispatch_request method."""
         dashboard = Dashboard()
-        dashboard.context = {"data": "example"}
-        dashboard.dispatch_request()
+        dashboard.context = {"version": "1.0"}
+        with create_app().test_request_context():
+            response = dashboard.dispatch_request()
         mock_render_template.assert_called_once_with(
             "dashboard.html",
-            data="example",
+            version="1.0",
         )
+        self.assertEqual(response.get_data(as_text=True), "page")
+        self.assertTrue(response.cache_control.no_cache)
+
+    @patch("rpidash.views.dashboard.render_template")
+    @patch("rpidash.views.dashboard.Dashboard.setup_context")
+    def test_dispatch_request_not_modified(
+        self,
+        mock_setup_context,
+        mock_render_template,
+    ):  # pylint: disable=unused-argument
+        """Test the dashboard is not rendered for a cached version."""
+        dashboard = Dashboard()
+        dashboard.context = {"version": "1.0"}
+        etag = make_etag("1.0")
+        with create_app().test_request_context(
+            headers={"If-None-Match": f'W/"{etag}"'},
+        ):
+            response = dashboard.dispatch_request()
+        self.assertEqual(response.status_code, 304)
+        mock_render_template.assert_not_called()
 
 
 if __name__ == "__main__":  # pragma: no cover
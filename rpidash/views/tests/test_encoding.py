@@ -0,0 +1,148 @@
+# STDLIB
+import gzip
+import json
+import struct
+import unittest
+
+# THIRD PARTY
+from flask import Flask, Response
+
+# FIRST PARTY
+from rpidash.views.encoding import (
+    compress_response,
+    encode_binary,
+    encode_compact,
+    stream_csv,
+    stream_json_columns,
+    stream_ndjson,
+)
+
+
+class TestEncoding(unittest.TestCase):
+    """A test suite for the history response encodings."""
+
+    def setUp(self):
+        """Set up common attributes for tests."""
+        self.data = {
+            "values": [50.0, 55.5, 60.25],
+            "dates": [1704110400, 1704110410, 1704110420],
+        }
+        self.app = Flask(__name__)
+
+    def test_encode_compact(self):
+        """Test the dates are delta encoded."""
+        self.assertEqual(
+            encode_compact(self.data),
+            {
+                "timestamps": [1704110400, 10, 10],
+                "values": [50.0, 55.5, 60.25],
+            },
+        )
+
+    def test_encode_compact_empty(self):
+        """Test empty history is encoded without timestamps."""
+        self.assertEqual(
+            encode_compact({"values": [], "dates": []}),
+            {"timestamps": [], "values": []},
+        )
+
+    def test_encode_binary(self):
+        """Test the history is packed as little-endian arrays."""
+        self.data["min"] = [1.0, 2.0, 3.0]
+        encoded = encode_binary(self.data)
+
+        self.assertEqual(len(encoded), 8 + 3 * 4 * 3)
+        self.assertEqual(struct.unpack_from("<II", encoded), (3, 2))
+        self.assertEqual(
+            struct.unpack_from("<3i", encoded, 8),
+            (1704110400, 1704110410, 1704110420),
+        )
+        self.assertEqual(
+            struct.unpack_from("<3f", encoded, 20),
+            (50.0, 55.5, 60.25),
+        )
+        self.assertEqual(
+            struct.unpack_from("<3f", encoded, 32),
+            (1.0, 2.0, 3.0),
+        )
+
+    def test_stream_csv(self):
+        """Test every chunk of rows is encoded as CSV."""
+        chunks = [[("2024-01-01T12:00:00", 50.0)], [], [("x,y", 1.5)]]
+        self.assertEqual(
+            list(stream_csv(("date", "temperature"), chunks)),
+            [
+                "date,temperature\n",
+                "2024-01-01T12:00:00,50.0\n",
+                "",
+                '"x,y",1.5\n',
+            ],
+        )
+
+    def test_stream_ndjson(self):
+        """Test every row is encoded as a JSON object on its own line."""
+        chunks = [[("2024-01-01T12:00:00", 50.0), ("2024-01-01T12:00:10", 1)]]
+        self.assertEqual(
+            "".join(stream_ndjson(("date", "temperature"), chunks)),
+            '{"date": "2024-01-01T12:00:00", "temperature": 50.0}\n'
+            '{"date": "2024-01-01T12:00:10", "temperature": 1}\n',
+        )
+
+    def test_stream_json_columns(self):
+        """Test the chunked columns are encoded as one JSON object."""
+        chunks = [
+            [("2024-01-01T12:00:00", 50.0), ("2024-01-01T12:00:10", 55.5)],
+            [],
+            [("2024-01-01T12:00:20", 60.25)],
+        ]
+        encoded = "".join(stream_json_columns(("dates", "values"), chunks))
+        self.assertEqual(
+            json.loads(encoded),
+            {
+                "dates": [
+                    "2024-01-01T12:00:00",
+                    "2024-01-01T12:00:10",
+                    "2024-01-01T12:00:20",
+                ],
+                "values": [50.0, 55.5, 60.25],
+            },
+        )
+        self.assertEqual(
+            json.loads("".join(stream_json_columns(("dates", "values"), []))),
+            {"dates": [], "values": []},
+        )
+        self.assertEqual(json.loads("".join(stream_json_columns((), []))), {})
+
+    def test_compress_response(self):
+        """Test large JSON responses are compressed."""
+        body = b"[" + b"1," * 1000 + b"1]"
+        with self.app.test_request_context(
+            headers={"Accept-Encoding": "gzip, deflate"},
+        ):
+            response = compress_response(
+                Response(body, mimetype="application/json"),
+            )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()), body)
+        self.assertIn("Accept-Encoding", response.vary)
+
+    def test_compress_response_skipped(self):
+        """Test small responses and clients without gzip are skipped."""
+        body = b"[" + b"1," * 1000 + b"1]"
+        with self.app.test_request_context():
+            response = compress_response(
+                Response(body, mimetype="application/json"),
+            )
+        self.assertNotIn("Content-Encoding", response.headers)
+
+        with self.app.test_request_context(
+            headers={"Accept-Encoding": "gzip"},
+        ):
+            response = compress_response(
+                Response(b"[1]", mimetype="application/json"),
+            )
+        self.assertNotIn("Content-Encoding", response.headers)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()